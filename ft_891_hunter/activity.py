@@ -0,0 +1,120 @@
+"""Spot counts per band, mode, programme and continent over sliding time windows"""
+
+import threading
+import time
+from collections import Counter
+
+from ft_891_hunter.bandplan import band
+
+WINDOWS = (15, 60, 180)
+DIMENSIONS = ('band', 'mode', 'programme', 'continent')
+
+
+def dimensions(spot):
+    """(dimension, value) pairs the spot is counted under; empty values are left out"""
+
+    entity = spot.entity
+    values = (band(spot.frequency), spot.mode, spot.programme, entity.continent if entity else '')
+    return [(dimension, value) for dimension, value in zip(DIMENSIONS, values) if value]
+
+
+class ActivityAggregator:
+    """
+    Spots are counted in one-minute buckets by spot time; every window (in minutes)
+    keeps running totals, which are adjusted by added and removed spots and by buckets
+    sliding out of the window, so queries never scan the spots.
+    """
+
+    def __init__(self, windows=WINDOWS, clock=time.time):
+        self.windows = sorted(windows)
+        self.clock = clock
+        self.buckets = {}
+        self.totals = {window: Counter() for window in self.windows}
+        self.minute = int(clock() // 60)
+        self.changed = False
+        self._lock = threading.Lock()
+
+    def update(self, added=(), removed=()):
+        """Apply a delta of the spot store; True if any count has changed since the previous update"""
+
+        with self._lock:
+            self._advance()
+            for spot in added:
+                self._count(spot, 1)
+            for spot in removed:
+                self._count(spot, -1)
+            changed, self.changed = self.changed, False
+            return changed
+
+    def count(self, window, dimension, value):
+        """Spots of the last window minutes with the given value, e.g. count(60, 'band', '20m')"""
+
+        with self._lock:
+            self._advance()
+            return self.totals[window][dimension, value]
+
+    def summary(self):
+        """{window: {dimension: {value: count}}}, values ordered by count"""
+
+        with self._lock:
+            self._advance()
+            result = {}
+            for window, totals in self.totals.items():
+                grouped = result[window] = {dimension: {} for dimension in DIMENSIONS}
+                for (dimension, value), count in totals.most_common():
+                    grouped[dimension][value] = count
+            return result
+
+    def _count(self, spot, sign):
+        minute = int(spot.timestamp.timestamp() // 60)
+        if minute <= self.minute - self.windows[-1]:
+            return
+        keys = dimensions(spot)
+        if not keys:
+            return
+        self.changed = True
+        bucket = self.buckets.setdefault(minute, Counter())
+        for key in keys:
+            bucket[key] += sign
+        for window in self.windows:
+            if minute > self.minute - window:
+                totals = self.totals[window]
+                for key in keys:
+                    totals[key] += sign
+                    if totals[key] <= 0:
+                        del totals[key]
+
+    def _advance(self):
+        """
+        Subtract buckets which have slid out of each window since the last call;
+        recount from the buckets if the clock has jumped, e.g. back to the start of a replay
+        """
+
+        minute = int(self.clock() // 60)
+        if minute == self.minute:
+            return
+        if minute < self.minute or minute - self.minute > self.windows[-1]:
+            self._rebuild(minute)
+            return
+        for window in self.windows:
+            totals = self.totals[window]
+            for old in range(self.minute - window + 1, minute - window + 1):
+                bucket = self.buckets.get(old, Counter())
+                if any(bucket.values()):
+                    totals.subtract(bucket)
+                    self.changed = True
+            self.totals[window] = +totals
+        for old in range(self.minute - self.windows[-1] + 1, minute - self.windows[-1] + 1):
+            self.buckets.pop(old, None)
+        self.minute = minute
+
+    def _rebuild(self, minute):
+        self.changed = self.changed or any(self.totals.values())
+        self.minute = minute
+        self.buckets = {old: bucket for old, bucket in self.buckets.items() if old > minute - self.windows[-1]}
+        for window in self.windows:
+            totals = Counter()
+            for old, bucket in self.buckets.items():
+                if old > minute - window:
+                    totals.update(bucket)
+            self.totals[window] = +totals
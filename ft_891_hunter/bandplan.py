@@ -0,0 +1,109 @@
+"""
+IARU Region 1 bands and band plan, used to name the band of a spot and to infer
+the mode of spots from sources which do not report it
+"""
+
+import re
+from bisect import bisect_right
+
+# (start kHz, end kHz, mode) with start inclusive and end exclusive, sorted and not overlapping;
+# FT8 segments span the dial frequency and the 3 kHz audio passband above it.
+BAND_PLAN = (
+    (1810, 1838, 'CW'),
+    (1840, 1843, 'FT8'),
+    (1843, 2000, 'SSB'),
+    (3500, 3570, 'CW'),
+    (3573, 3576, 'FT8'),
+    (3600, 3800, 'SSB'),
+    (7000, 7040, 'CW'),
+    (7060, 7074, 'SSB'),
+    (7074, 7077, 'FT8'),
+    (7077, 7200, 'SSB'),
+    (10100, 10130, 'CW'),
+    (10136, 10139, 'FT8'),
+    (14000, 14070, 'CW'),
+    (14074, 14077, 'FT8'),
+    (14112, 14350, 'SSB'),
+    (18068, 18095, 'CW'),
+    (18100, 18103, 'FT8'),
+    (18111, 18168, 'SSB'),
+    (21000, 21070, 'CW'),
+    (21074, 21077, 'FT8'),
+    (21151, 21450, 'SSB'),
+    (24890, 24915, 'CW'),
+    (24915, 24918, 'FT8'),
+    (24931, 24990, 'SSB'),
+    (28000, 28070, 'CW'),
+    (28074, 28077, 'FT8'),
+    (28300, 29000, 'SSB'),
+    (29510, 29700, 'FM'),
+    (50000, 50100, 'CW'),
+    (50100, 50313, 'SSB'),
+    (50313, 50316, 'FT8'),
+    (50316, 50500, 'SSB'),
+    (51410, 52000, 'FM'),
+    (144000, 144110, 'CW'),
+    (144110, 144174, 'SSB'),
+    (144174, 144177, 'FT8'),
+    (144177, 144400, 'SSB'),
+    (144500, 146000, 'FM'),
+    (432000, 432100, 'CW'),
+    (432100, 432174, 'SSB'),
+    (432174, 432177, 'FT8'),
+    (432177, 432400, 'SSB'),
+    (433000, 440000, 'FM'),
+)
+starts = [start for start, _, _ in BAND_PLAN]
+
+# (start kHz, end kHz, band) of the IARU Region 1 amateur bands, both ends inclusive, sorted;
+# shared by the spot filter and the activity counts
+BANDS = (
+    (1810, 2000, '160m'),
+    (3500, 3800, '80m'),
+    (5351.5, 5366.5, '60m'),
+    (7000, 7200, '40m'),
+    (10100, 10150, '30m'),
+    (14000, 14350, '20m'),
+    (18068, 18168, '17m'),
+    (21000, 21450, '15m'),
+    (24890, 24990, '12m'),
+    (28000, 29700, '10m'),
+    (50000, 52000, '6m'),
+    (144000, 146000, '2m'),
+    (430000, 440000, '70cm'),
+)
+band_starts = [start for start, _, _ in BANDS]
+
+KEYWORD_MODES = {'CW': 'CW', 'SSB': 'SSB', 'USB': 'SSB', 'LSB': 'SSB', 'FT8': 'FT8', 'FT4': 'FT4', 'FM': 'FM'}
+keyword_re = re.compile(r"\b(" + "|".join(KEYWORD_MODES) + r")\b", re.I)
+
+
+def band_plan_mode(frequency):
+    """Mode of the band plan segment containing the frequency in kHz, '' if outside of any segment"""
+
+    if not frequency:
+        return ''
+    idx = bisect_right(starts, frequency) - 1
+    if idx >= 0 and frequency < BAND_PLAN[idx][1]:
+        return BAND_PLAN[idx][2]
+    return ''
+
+
+def band(frequency):
+    """Name of the amateur band of the frequency in kHz, '' if outside of the bands"""
+
+    if not frequency:
+        return ''
+    idx = bisect_right(band_starts, frequency) - 1
+    if idx >= 0 and frequency <= BANDS[idx][1]:
+        return BANDS[idx][2]
+    return ''
+
+
+def infer_mode(frequency, comment):
+    """Mode named in the comment, otherwise the one of the band plan segment"""
+
+    match = keyword_re.search(comment or '')
+    if match:
+        return KEYWORD_MODES[match.group(1).upper()]
+    return band_plan_mode(frequency)
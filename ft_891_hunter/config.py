@@ -10,6 +10,7 @@ from platformdirs import user_cache_dir, user_config_dir
 APP_NAME = "ft_891_hunter"
 config_dir = user_config_dir(APP_NAME)
 ENV_PATH = os.path.join(config_dir, ".env")
+WATCHLIST_PATH = os.path.join(config_dir, "watchlist.txt")
 if os.path.exists(ENV_PATH):
     load_dotenv(ENV_PATH)
 else:
@@ -22,15 +23,43 @@ else:
 
 UPDATE_PERIOD = int(os.getenv("SPOT_UPDATE_PERIOD", "30")) * 1000
 API_TIMEOUT = 5
+REFRESH_DEADLINE = int(float(os.getenv("REFRESH_DEADLINE", "2")) * 1000)
+MIN_REFRESH_INTERVAL = int(float(os.getenv("MIN_REFRESH_INTERVAL", "1")) * 1000)
 STATUS_TIMEOUT = 5_000
 PREFERRED_BANDS = set(os.getenv("PREFERRED_BANDS", "").lower().split(','))
 PREFERRED_MODES = set(os.getenv("PREFERRED_MODES", "").upper().split(','))
 MY_LATITUDE = float(os.getenv("MY_LATITUDE", "0.0"))
 MY_LONGITUDE = float(os.getenv("MY_LONGITUDE", "0.0"))
+SPOT_MAX_AGE = int(os.getenv("SPOT_MAX_AGE", "0")) * 60
+SPOT_MAX_PER_SOURCE = int(os.getenv("SPOT_MAX_PER_SOURCE", "0"))
+SPOT_MAX_TOTAL = int(os.getenv("SPOT_MAX_TOTAL", "0"))
+EVICT_PERIOD = int(os.getenv("EVICT_PERIOD", "30")) * 1000
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "8"))
+FETCH_PER_HOST = int(os.getenv("FETCH_PER_HOST", "2"))
+
+SUMMIT_PREWARM_RADIUS = float(os.getenv("SUMMIT_PREWARM_RADIUS", "300"))
+SUMMIT_PREWARM_PERIOD = int(os.getenv("SUMMIT_PREWARM_PERIOD", "60")) * 60_000
+SUMMIT_REQUEST_INTERVAL = float(os.getenv("SUMMIT_REQUEST_INTERVAL", "2"))
+SUMMIT_MAX_AGE = int(os.getenv("SUMMIT_MAX_AGE", "30")) * 86400
+
+API_URLS = {
+    'pota': "https://api.pota.app/v1/spots",
+    'sota': "https://api-db2.sota.org.uk/api/spots/-2/all/all",
+    'dxsummit': "http://www.dxsummit.fi/api/v1/spots",
+    'dxheat': "https://dxheat.com/source/spots/?a=65&b=15&b=40&m=CW&m=PHONE&m=DIGI&valid=1&spam=1",
+}
 
 cache_dir = user_cache_dir(APP_NAME)
 os.makedirs(cache_dir, exist_ok=True)
 SHELVE_PATH = os.path.join(cache_dir, "sota.db")
+GRID_CACHE_PATH = os.path.join(cache_dir, "grid.bin")
+CTY_PATH = os.getenv("CTY_PATH")
+RECORD_PATH = os.getenv("RECORD_PATH")
+REPLAY_PATH = os.getenv("REPLAY_PATH")
+REPLAY_SPEED = float(os.getenv("REPLAY_SPEED", "1.0"))
+PROFILE = os.getenv("PROFILE", "false").lower() == "true" or "--profile" in sys.argv
+PROFILE_CYCLES = int(os.getenv("PROFILE_CYCLES", "0"))
+SLOW_FRAME = int(os.getenv("SLOW_FRAME", "100"))
 
 
 serial_settings = {
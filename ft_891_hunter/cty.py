@@ -0,0 +1,153 @@
+"""DXCC entity lookup by callsign prefix, based on a cty.dat style country file"""
+
+import functools
+import re
+from collections import namedtuple
+from importlib.resources import files
+
+from ft_891_hunter.config import CTY_PATH
+
+Entity = namedtuple(
+        "Entity",
+        ['name', 'cq_zone', 'itu_zone', 'continent', 'latitude', 'longitude', 'utc_offset', 'prefix']
+)
+
+alias_re = re.compile(r"(?P<exact>=?)(?P<call>[A-Z0-9/]+)(?P<overrides>.*)")
+override_re = re.compile(
+    r"\((?P<cq_zone>\d+)\)|\[(?P<itu_zone>\d+)\]|<(?P<latitude>[-\d.]+)/(?P<longitude>[-\d.]+)>"
+    r"|\{(?P<continent>[A-Z]{2})\}|~(?P<utc_offset>[-\d.]+)~"
+)
+# Portable/mobile designators which never determine the entity
+call_suffixes = {'P', 'M', 'MM', 'AM', 'QRP', 'A', 'B', 'LH', 'AG', 'AE', 'KT', 'J', 'R'}
+
+
+def parse_header(header):
+    """Convert the colon separated entity line; longitude and UTC offset are stored with East positive"""
+
+    name, cq_zone, itu_zone, continent, lat, lon, utc_offset, prefix = (
+        field.strip() for field in header.split(':')[:8]
+    )
+    return Entity(
+        name, int(cq_zone), int(itu_zone), continent,
+        float(lat), -float(lon), -float(utc_offset), prefix.lstrip('*')
+    )
+
+
+def apply_overrides(entity, overrides):
+    """Zone, coordinate, continent and time zone exceptions of a single alias"""
+
+    for match in override_re.finditer(overrides):
+        values = {k: v for k, v in match.groupdict().items() if v is not None}
+        if 'cq_zone' in values or 'itu_zone' in values:
+            values = {k: int(v) for k, v in values.items()}
+        elif 'latitude' in values:
+            values = {'latitude': float(values['latitude']), 'longitude': -float(values['longitude'])}
+        elif 'utc_offset' in values:
+            values = {'utc_offset': -float(values['utc_offset'])}
+        entity = entity._replace(**values)
+    return entity
+
+
+def parse_country_file(text):
+    """Yield (alias, is_exact_call, entity) for each alias of each entity record"""
+
+    for record in text.split(';'):
+        header, _, aliases = record.strip().partition('\n')
+        if not header:
+            continue
+        entity = parse_header(header)
+        for alias in aliases.replace('\n', '').split(','):
+            match = alias_re.match(alias.strip())
+            if match:
+                yield match['call'], bool(match['exact']), apply_overrides(entity, match['overrides'])
+
+
+def callsign_parts(callsign):
+    """Parts of a compound callsign without portable designators (/P, /QRP, /7 ...)"""
+
+    return [
+        part for part in callsign.split('/')
+        if part and part not in call_suffixes and not (len(part) == 1 and part.isdigit())
+    ]
+
+
+def home_part(callsign):
+    """
+    Pick the part of a compound callsign which determines the entity:
+    drop portable designators, then prefer the shorter part (OE/PA3EFR/P -> OE).
+    """
+
+    parts = callsign_parts(callsign)
+    if not parts:
+        return callsign
+    return min(parts, key=len)
+
+
+def base_call(callsign):
+    """
+    Pick the operator's own callsign from a compound callsign:
+    drop portable designators, then prefer the longer part (OE/PA3EFR/P -> PA3EFR).
+    """
+
+    parts = callsign_parts(callsign)
+    if not parts:
+        return callsign
+    return max(parts, key=len)
+
+
+class PrefixTrie:
+    """Longest prefix match of callsigns; lookup cost depends only on the callsign length"""
+
+    def __init__(self):
+        self.root = {}
+        self.exact = {}
+
+    @classmethod
+    def from_text(cls, text):
+        trie = cls()
+        for alias, exact, entity in parse_country_file(text):
+            if exact:
+                trie.exact[alias] = entity
+            else:
+                trie.insert(alias, entity)
+        return trie
+
+    def insert(self, prefix, entity):
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[None] = entity
+
+    def lookup(self, callsign):
+        """Return the Entity of the callsign or None if no prefix matches"""
+
+        callsign = callsign.strip().upper()
+        if callsign in self.exact:
+            return self.exact[callsign]
+        call = home_part(callsign)
+        if call in self.exact:
+            return self.exact[call]
+        node = self.root
+        found = None
+        for char in call:
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+
+@functools.cache
+def default_trie():
+    """Trie built from the user supplied country file or from the one bundled with the package"""
+
+    if CTY_PATH:
+        with open(CTY_PATH, encoding='latin-1') as cty:
+            return PrefixTrie.from_text(cty.read())
+    return PrefixTrie.from_text(files("ft_891_hunter.resources").joinpath("cty.dat").read_text(encoding='ascii'))
+
+
+def lookup(callsign):
+    """Resolve the callsign to its DXCC entity"""
+
+    return default_trie().lookup(callsign)
@@ -2,14 +2,20 @@
 
 from collections import deque
 
-from PyQt6.QtCore import QObject, Qt, QThread, pyqtSignal, pyqtSlot
+from PyQt6.QtCore import QObject, Qt, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import (QAbstractItemView,  # pylint: disable=E0401,E0611
-                             QDialog, QLabel, QListWidget, QPlainTextEdit,
+                             QComboBox, QDialog, QLabel, QListWidget, QPlainTextEdit,
                              QPushButton, QStackedLayout, QTableWidget,
-                             QTableWidgetItem, QVBoxLayout)
+                             QTableWidgetItem, QVBoxLayout, QWidget)
 
+from ft_891_hunter.activity import WINDOWS
+from ft_891_hunter.bandplan import BANDS
 from ft_891_hunter.config import PREFERRED_BANDS
 from ft_891_hunter.log import log_buffer, logger
+from ft_891_hunter.profiling import profiler
+from ft_891_hunter.search import SearchIndex
+from ft_891_hunter.store import spot_key
 
 
 class LogViewer(QDialog):
@@ -41,10 +47,11 @@ class LogViewer(QDialog):
         into a sigle blob of text, suitable for QPlainTextEdit widget
         """
 
-        self.render_thread = QThread()
+        self.render_thread = profiler.thread("LogRenderer")
         self.renderer = LogRenderer()
         self.renderer.moveToThread(self.render_thread)
-        self.render_thread.started.connect(self.renderer.run)
+        # queued, so that it runs in the event loop of the thread, after profiling has started
+        self.render_thread.started.connect(self.renderer.run, Qt.ConnectionType.QueuedConnection)
         self.renderer.finished.connect(self.update_logs)
         self.renderer.finished.connect(self.render_thread.quit)
         self.renderer.finished.connect(self.renderer.deleteLater)
@@ -82,6 +89,7 @@ class SpotTable(QTableWidget):
         "Dist [km]",
         "Source"
     ]
+    watched_color = QColor("#6b5b00")
 
     def __init__(self, stack):
         super().__init__()
@@ -91,6 +99,13 @@ class SpotTable(QTableWidget):
         self.setSortingEnabled(False)
         self.freq_index = self.spot_columns.index("Freq")
         self.stack = stack
+        self.row_keys = []
+        self.key_rows = {}
+        self.id_rows = {}
+        self.watched = set()
+        self.search_index = SearchIndex()
+        self.query = ''
+        self.shown_rows = None
 
     @pyqtSlot(list)
     def populate_table(self, unique):
@@ -103,6 +118,7 @@ class SpotTable(QTableWidget):
         self.stack.setCurrentIndex(0)
         self.setUpdatesEnabled(False)
         self.setRowCount(len(unique))
+        self.row_keys = [item.key for item in unique]
         logger.debug('Populating table with {} spots', len(unique))
         for item in unique:
             idx = item.idx
@@ -122,13 +138,93 @@ class SpotTable(QTableWidget):
             dist.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
             self.setItem(idx, 8, dist)
             self.setItem(idx, 9, QTableWidgetItem(item.origin))
+            if item.key in self.watched:
+                self.highlight_row(idx)
         logger.debug('Table finished')
+        self.sync_rows()
+        self.apply_search()
         self.setUpdatesEnabled(True)
         self.resizeColumnsToContents()
         self.clearSelection()
         self.setCurrentCell(-1, -1)
         self.stack.setCurrentIndex(1)
 
+    @pyqtSlot(list, list)
+    def remove_spots(self, _added, removed):
+        """Drop rows of spots removed from the store, without waiting for the next refresh"""
+
+        if not removed:
+            return
+        gone = {spot_key(spot) for spot in removed}
+        self.watched -= gone
+        rows = sorted(self.key_rows[key] for key in gone if key in self.key_rows)
+        for row in reversed(rows):
+            self.removeRow(row)
+            del self.row_keys[row]
+        if rows:
+            self.sync_rows()
+
+    @pyqtSlot(list, list)
+    def index_spots(self, added, removed):
+        """Keep the search index in step with the spot store"""
+
+        self.search_index.update(added, removed)
+        for spot in added:
+            row = self.key_rows.get(spot_key(spot))
+            if row is not None:
+                self.id_rows[self.search_index.ident(spot_key(spot))] = row
+
+    @pyqtSlot(str)
+    def search(self, text):
+        self.query = text
+        self.apply_search()
+
+    def sync_rows(self):
+        """Map spot keys and search ids to rows and read back which rows are shown, after rows have changed"""
+
+        self.key_rows = {key: row for row, key in enumerate(self.row_keys)}
+        self.id_rows = {}
+        for key, row in self.key_rows.items():
+            ident = self.search_index.ident(key)
+            if ident is not None:
+                self.id_rows[ident] = row
+        self.shown_rows = {row for row in range(self.rowCount()) if not self.isRowHidden(row)}
+
+    def apply_search(self):
+        """
+        Hide rows not matching the query; only rows in the difference between
+        the previous and the current matches are touched (all rows when the query starts or ends)
+        """
+
+        found = self.search_index.search(self.query)
+        shown = None if found is None else {self.id_rows[ident] for ident in found if ident in self.id_rows}
+        previous = self.shown_rows
+        if previous is None and shown is None:
+            return
+        if previous is None or shown is None:
+            matched = shown if previous is None else previous
+            changed = (row for row in range(self.rowCount()) if row not in matched)
+        else:
+            changed = previous ^ shown
+        for row in changed:
+            self.setRowHidden(row, shown is not None and row not in shown)
+        self.shown_rows = shown
+
+    @pyqtSlot(list)
+    def mark_watched(self, matched):
+        """Highlight spots matching the watchlist, now and after each refresh"""
+
+        keys = {spot_key(spot) for spot, _ in matched}
+        self.watched |= keys
+        for key in keys & self.key_rows.keys():
+            self.highlight_row(self.key_rows[key])
+
+    def highlight_row(self, row):
+        for column in range(self.columnCount()):
+            item = self.item(row, column)
+            if item:
+                item.setBackground(self.watched_color)
+
     def get_selected_freq(self, row):
         """Get frequency from the selected cell as int kHz"""
 
@@ -139,8 +235,46 @@ class SpotTable(QTableWidget):
             return None
 
 
+class ActivityStrip(QWidget):
+    """Compact summary of spot counts per band, mode, programme and continent in the selected window"""
+
+    top = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.summary = {}
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.window_box = QComboBox()
+        self.window_box.addItems([f"Last {window} min" for window in WINDOWS])
+        self.window_box.setCurrentIndex(1)
+        self.window_box.currentIndexChanged.connect(self.show_counts)
+
+        self.counts = QLabel(alignment=Qt.AlignmentFlag.AlignTop)
+        self.counts.setStyleSheet('font-family: "Courier New", monospace;')
+
+        layout.addWidget(self.window_box)
+        layout.addWidget(self.counts, 1)
+        self.setFixedWidth(200)
+
+    @pyqtSlot(dict)
+    def update_activity(self, summary):
+        self.summary = summary
+        self.show_counts()
+
+    def show_counts(self):
+        window = WINDOWS[self.window_box.currentIndex()]
+        lines = []
+        for dimension, counts in self.summary.get(window, {}).items():
+            lines.append(dimension.upper())
+            lines.extend(f"{value[:12]:<12} {count:>5}" for value, count in list(counts.items())[:self.top])
+            lines.append("")
+        self.counts.setText("\n".join(lines))
+
+
 class FilterSelector(QDialog):
-    all_bands = ['80m', '40m', '20m', '15m', '10m', '6m', '2m', '70cm']
+    all_bands = [name for _, _, name in BANDS]
 
     def __init__(self, table_updater, parent=None):
         super().__init__(parent)
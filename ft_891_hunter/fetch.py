@@ -0,0 +1,90 @@
+"""Qt independent fetch backend based on asyncio and a pooled HTTP session"""
+
+import asyncio
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ft_891_hunter.config import API_TIMEOUT, API_URLS, FETCH_CONCURRENCY, FETCH_PER_HOST
+from ft_891_hunter.log import logger
+
+
+def make_session(pool_size=FETCH_CONCURRENCY, per_host=FETCH_PER_HOST):
+    """
+    Create a keep-alive session; at most per_host connections are opened
+    to a single host, further requests wait for a free connection.
+    """
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=per_host, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+http_session = make_session()
+
+
+class AsyncFetcher:
+    """
+    Fetch spots from each API with asyncio and pass the raw payload to store_spots,
+    the same way ApiManager does, but without the Qt event loop.
+    """
+
+    def __init__(self, store_spots, apis=None, session=None,
+                 concurrency=FETCH_CONCURRENCY, per_host=FETCH_PER_HOST, timeout=API_TIMEOUT):
+        self.store_spots = store_spots
+        self.apis = dict(API_URLS if apis is None else apis)
+        self.session = session or http_session
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.active_requests = set()
+        self.tasks = set()
+
+    async def fetch_all(self):
+        """Fetch from each defined API concurrently, skipping those which are still pending"""
+
+        limit = asyncio.Semaphore(self.concurrency)
+        host_limits = {}
+        store_lock = asyncio.Lock()
+        jobs = []
+        for name, url in self.apis.items():
+            if name in self.active_requests:
+                logger.info("Skipping fetch from {}, because another is pending", name)
+                continue
+            self.active_requests.add(name)
+            host_limit = host_limits.setdefault(urlsplit(url).netloc, asyncio.Semaphore(self.per_host))
+            jobs.append(self.fetch(name, url, (limit, host_limit), store_lock))
+        await asyncio.gather(*jobs)
+
+    async def fetch(self, name, url, limits, store_lock):
+        """Download a single API response and store it; spots are stored one source at a time"""
+
+        limit, host_limit = limits
+        try:
+            async with limit, host_limit:
+                logger.debug("Fetching from {}", url)
+                response = await asyncio.to_thread(self.session.get, url, timeout=self.timeout)
+            logger.debug("{} has finished", name)
+            if response.status_code != 200:
+                logger.warning("Error for {}: code = {}", name, response.status_code)
+                return
+            async with store_lock:
+                await asyncio.to_thread(self.store_spots, (name, response.text))
+        except requests.RequestException as exc:
+            logger.warning("Error for {}: {}", name, exc)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Failed to store spots from {}", name)
+        finally:
+            self.active_requests.discard(name)
+
+    async def run(self, poll_time):
+        """Fetch from all APIs every poll_time milliseconds, until cancelled"""
+
+        while True:
+            task = asyncio.create_task(self.fetch_all())
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+            await asyncio.sleep(poll_time / 1000)
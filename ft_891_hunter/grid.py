@@ -0,0 +1,126 @@
+"""
+Lookup table of Maidenhead squares with their centre, distance and bearing
+relative to own coordinates (from the env), cached on disk
+"""
+
+import functools
+import math
+import os
+from array import array
+from collections import namedtuple
+
+import haversine
+import maidenhead
+
+from ft_891_hunter.config import GRID_CACHE_PATH, MY_LATITUDE, MY_LONGITUDE
+from ft_891_hunter.log import logger
+
+GridSquare = namedtuple("GridSquare", ['latitude', 'longitude', 'distance', 'bearing'])
+
+FIELDS = 18
+SQUARES = FIELDS * FIELDS * 10 * 10
+COLUMNS = len(GridSquare._fields)
+
+
+def distance_bearing(origin, point):
+    """Great circle distance in km and initial bearing in degrees from origin to point"""
+
+    lat1, lon1 = map(math.radians, origin)
+    lat2, lon2 = map(math.radians, point)
+    d_lon = lon2 - lon1
+    bearing = math.degrees(math.atan2(
+        math.sin(d_lon) * math.cos(lat2),
+        math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(d_lon)
+    ))
+    return haversine.haversine(origin, point), bearing % 360
+
+
+def square_index(locator):
+    """Position of a 4-character square in the table; raise ValueError if it is not valid"""
+
+    if len(locator) < 4:
+        raise ValueError(f"Invalid locator {locator}")
+    field_lon = ord(locator[0].upper()) - ord('A')
+    field_lat = ord(locator[1].upper()) - ord('A')
+    square_lon = ord(locator[2]) - ord('0')
+    square_lat = ord(locator[3]) - ord('0')
+    if not (0 <= field_lon < FIELDS and 0 <= field_lat < FIELDS and 0 <= square_lon < 10 and 0 <= square_lat < 10):
+        raise ValueError(f"Invalid locator {locator}")
+    return ((field_lon * FIELDS + field_lat) * 10 + square_lon) * 10 + square_lat
+
+
+def square_centre(index):
+    """Latitude and longitude of the centre of the square at the given table position"""
+
+    rest, square_lat = divmod(index, 10)
+    rest, square_lon = divmod(rest, 10)
+    field_lon, field_lat = divmod(rest, FIELDS)
+    return field_lat * 10 - 90 + square_lat + 0.5, field_lon * 20 - 180 + square_lon * 2 + 1
+
+
+class GridTable:
+    """Flat array with one row (latitude, longitude, distance, bearing) per 4-character square"""
+
+    def __init__(self, origin, values):
+        self.origin = origin
+        self.values = values
+
+    @classmethod
+    def build(cls, origin):
+        values = array('d')
+        for index in range(SQUARES):
+            centre = square_centre(index)
+            values.extend(centre + distance_bearing(origin, centre))
+        return cls(origin, values)
+
+    @classmethod
+    def load(cls, path, origin):
+        """Read the table from the cache file; rebuild and save it if missing or made for other coordinates"""
+
+        values = array('d')
+        try:
+            with open(path, 'rb') as cache:
+                values.fromfile(cache, 2 + SQUARES * COLUMNS)
+            if tuple(values[:2]) == tuple(origin):
+                return cls(origin, values[2:])
+        except (OSError, EOFError):
+            pass
+        logger.debug("Building grid square table for {}", origin)
+        table = cls.build(origin)
+        table.save(path)
+        return table
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as cache:
+            array('d', self.origin).tofile(cache)
+            self.values.tofile(cache)
+        os.replace(tmp_path, path)
+
+    def square(self, locator):
+        offset = square_index(locator) * COLUMNS
+        return GridSquare(*self.values[offset:offset + COLUMNS])
+
+
+@functools.cache
+def default_table():
+    return GridTable.load(GRID_CACHE_PATH, (MY_LATITUDE, MY_LONGITUDE))
+
+
+@functools.lru_cache(maxsize=4096)
+def subsquare(locator):
+    """Centre, distance and bearing of a 6-character subsquare, computed once per locator"""
+
+    square_index(locator)
+    if not ('a' <= locator[4] <= 'x' and 'a' <= locator[5] <= 'x'):
+        raise ValueError(f"Invalid locator {locator}")
+    centre = maidenhead.to_location(locator, center=True)
+    return GridSquare(*centre, *distance_bearing((MY_LATITUDE, MY_LONGITUDE), centre))
+
+
+def lookup(locator):
+    """GridSquare for a locator with at least 4 characters; precision above 6 characters is dropped"""
+
+    if len(locator) >= 6:
+        return subsquare(locator[:4].upper() + locator[4:6].lower())
+    return default_table().square(locator[:4])
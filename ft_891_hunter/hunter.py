@@ -2,13 +2,17 @@ import sys
 from importlib.resources import files
 
 import serial
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtWidgets import (QApplication, QLabel, QMainWindow, QPushButton, QDialog,  # pylint: disable=E0401,E0611
-                             QStackedLayout, QVBoxLayout, QHBoxLayout, QWidget)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import (QApplication, QLabel, QLineEdit, QMainWindow, QPushButton, QDialog,  # pylint: disable=E0401,E0611
+                             QSplitter, QStackedLayout, QVBoxLayout, QHBoxLayout, QWidget)
 
-from ft_891_hunter.config import STATUS_TIMEOUT, UPDATE_PERIOD, serial_settings
-from ft_891_hunter.dialogs import LogViewer, SpotTable, FilterSelector
+from ft_891_hunter.config import (PROFILE, REPLAY_PATH, SLOW_FRAME, STATUS_TIMEOUT, SUMMIT_PREWARM_PERIOD,
+                                  UPDATE_PERIOD, serial_settings)
+from ft_891_hunter.dialogs import ActivityStrip, LogViewer, SpotTable, FilterSelector
 from ft_891_hunter.log import logger
+from ft_891_hunter.prewarm import SummitPrewarmer
+from ft_891_hunter.profiling import ProfilingApplication, profiler
+from ft_891_hunter.spotmap import SpotMap
 from ft_891_hunter.worker import ApiManager, SpotHandler, SpotTableUpdater
 
 
@@ -41,9 +45,23 @@ class MainWindow(QMainWindow):
         self.table = SpotTable(self.stack)
         self.table.cellClicked.connect(self.cell_clicked)
 
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search callsign, reference or comment")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.table.search)
+
         self.stack.addWidget(spinner_label)
         self.stack.addWidget(self.table)
 
+        self.activity_strip = ActivityStrip()
+        self.map = SpotMap()
+        self.map.hide()
+        self.map.spot_clicked.connect(self.tune_in)
+
+        splitter = QSplitter()
+        splitter.addWidget(stacked_container)
+        splitter.addWidget(self.map)
+
         button_container = QWidget()
         button_layout = QHBoxLayout()
         button_container.setLayout(button_layout)
@@ -51,6 +69,10 @@ class MainWindow(QMainWindow):
         filters_button = QPushButton("Filters")
         filters_button.clicked.connect(self.set_filters)
 
+        map_button = QPushButton("Map")
+        map_button.setCheckable(True)
+        map_button.toggled.connect(self.map.setVisible)
+
         logs_button = QPushButton("Logs")
         logs_button.setCheckable(True)
         logs_button.clicked.connect(self.show_logs)
@@ -59,32 +81,56 @@ class MainWindow(QMainWindow):
         quit_button.clicked.connect(QApplication.instance().quit)
 
         button_layout.addWidget(filters_button)
+        button_layout.addWidget(map_button)
         button_layout.addWidget(logs_button)
         button_layout.addWidget(quit_button)
 
-        main_layout.addWidget(stacked_container)
+        spots_container = QWidget()
+        spots_layout = QHBoxLayout()
+        spots_layout.setContentsMargins(0, 0, 0, 0)
+        spots_container.setLayout(spots_layout)
+        spots_layout.addWidget(splitter, 1)
+        spots_layout.addWidget(self.activity_strip)
+
+        main_layout.addWidget(self.search_box)
+        main_layout.addWidget(spots_container)
         main_layout.addWidget(button_container)
 
         self.resize(1400, 800)
 
         self.statusBar().showMessage("Starting", STATUS_TIMEOUT)
 
-        self.spot_processor_thread = QThread()
+        self.spot_processor_thread = profiler.thread("SpotHandler")
         self.spot_handler = SpotHandler()
         self.spot_handler.moveToThread(self.spot_processor_thread)
 
-        self.table_updater_thread = QThread()
+        self.table_updater_thread = profiler.thread("SpotTableUpdater")
         self.table_updater = SpotTableUpdater()
         self.table_updater.moveToThread(self.table_updater_thread)
         self.table_updater.finished.connect(self.table.populate_table)
+        self.table_updater.finished.connect(profiler.cycle_finished)
+        self.spot_handler.spots_changed.connect(self.table.index_spots)
+        self.spot_handler.spots_changed.connect(self.table.remove_spots)
+        self.spot_handler.watch_matched.connect(self.table.mark_watched)
+        self.spot_handler.watch_matched.connect(self.notify_watched)
+        self.spot_handler.activity_changed.connect(self.activity_strip.update_activity)
+        self.spot_handler.spots_changed.connect(self.map.update_spots)
 
         self.filter_spots.connect(self.table_updater.run)
+        self.filter_spots.connect(self.map.set_spots)
 
         self.api = ApiManager(self.table_updater, self.spot_handler, UPDATE_PERIOD)
 
         self.table_updater_thread.start()
         self.spot_processor_thread.start()
 
+        self.prewarmer = SummitPrewarmer()
+        self.prewarm_timer = QTimer(self)
+        self.prewarm_timer.timeout.connect(self.prewarmer.start)
+        if not REPLAY_PATH:
+            self.prewarm_timer.start(SUMMIT_PREWARM_PERIOD)
+            self.prewarmer.start()
+
     def show_logs(self):
         """Show dialog with recent log records"""
 
@@ -95,7 +141,17 @@ class MainWindow(QMainWindow):
         dlg = FilterSelector(self)
         result = dlg.exec()
         if result == QDialog.DialogCode.Accepted:
-            self.filter_spots.emit(self.spot_handler.spots)
+            self.filter_spots.emit(self.spot_handler.spots.snapshot())
+
+    def notify_watched(self, matched):
+        """Tell about new spots matching the watchlist in the status bar"""
+
+        spot, found = matched[0]
+        message = f"Watchlist: {spot.activator} on {spot.frequency} ({', '.join(found)})"
+        if len(matched) > 1:
+            message += f" and {len(matched) - 1} more"
+        self.statusBar().showMessage(message, STATUS_TIMEOUT * 3)
+        QApplication.alert(self)
 
     def cell_clicked(self, row, column):
         """When frequency cell clicked, tune the rig to that frequency"""
@@ -117,7 +173,12 @@ class MainWindow(QMainWindow):
 
 
 def get_app():
-    app = QApplication(sys.argv)
+    if PROFILE:
+        app = ProfilingApplication(sys.argv, SLOW_FRAME)
+        profiler.start_here("GUI")
+        app.aboutToQuit.connect(profiler.finish)
+    else:
+        app = QApplication(sys.argv)
     css_path = files("ft_891_hunter.resources").joinpath("dark.css")
     with open(css_path, encoding='ascii') as css:
         app.setStyleSheet(css.read())
@@ -0,0 +1,65 @@
+"""Incremental parsing of a JSON array, element by element, while it is still downloading"""
+
+import codecs
+import json
+import re
+
+whitespace_re = re.compile(r'\s*')
+
+
+class JsonArrayParser:
+    """
+    Feed chunks of bytes of a top-level JSON array of objects and get back each element
+    as soon as it is complete; only the unfinished element is kept in memory.
+    """
+
+    max_element = 1 << 20
+
+    def __init__(self):
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.state = 'start'
+
+    def feed(self, chunk):
+        """Return the list of elements completed within this chunk"""
+
+        buffer = self.buffer + self.text_decoder.decode(chunk)
+        items = []
+        pos = whitespace_re.match(buffer).end()
+        while pos < len(buffer):
+            if self.state == 'element':
+                try:
+                    item, pos = self.decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if len(buffer) - pos > self.max_element:
+                        raise
+                    break
+                items.append(item)
+                self.state = 'separator'
+            else:
+                self.state = self._next_state(buffer[pos])
+                pos += 1 if self.state != 'element' else 0
+            pos = whitespace_re.match(buffer, pos).end()
+        self.buffer = buffer[pos:]
+        return items
+
+    def close(self):
+        """Verify that the whole array has been received"""
+
+        self.text_decoder.decode(b'', final=True)
+        if self.state != 'end':
+            raise ValueError("Incomplete JSON array")
+
+    def _next_state(self, char):
+        """Follow the array syntax outside of elements; raise ValueError on anything unexpected"""
+
+        if self.state == 'start' and char == '[':
+            return 'first'
+        if self.state in ('first', 'separator') and char == ']':
+            return 'end'
+        if self.state == 'separator' and char == ',':
+            return 'next'
+        if self.state in ('first', 'next') and char == '{':
+            return 'element'
+        raise ValueError(f"Unexpected {char!r} in JSON array")
@@ -5,15 +5,19 @@ together with logic related to unification and alignment of data
 
 import re
 import shelve
+import threading
+import time
 from datetime import datetime, timezone
 from typing import Optional
 
 import haversine
 import maidenhead
-import requests
 from pydantic import BaseModel, Field, field_validator, model_validator
 
+from ft_891_hunter import grid
 from ft_891_hunter.config import MY_LATITUDE, MY_LONGITUDE, SHELVE_PATH, API_TIMEOUT
+from ft_891_hunter.cty import lookup
+from ft_891_hunter.fetch import http_session
 from ft_891_hunter.log import logger
 
 summit_re = re.compile(r"(?P<country>[A-Z0-9]{1,3})\/(?P<region>[A-Z]{2})-\d+")
@@ -21,6 +25,12 @@ wwff_re = re.compile(r"[A-Za-z0-9]{1,2}[Ff]{2}-[0-9]{4}")
 iota_re = re.compile(r"(^|\s)iota($|\s)", re.I)
 pota_re = re.compile(r"(^|\s)pota($|\s)", re.I)
 SOTA_REGION_URL = "https://api-db2.sota.org.uk/api/regions/{}/{}"
+REGION_KEY = "region:{}/{}"
+
+# Serializes access to the summit cache, which is shared with the prewarmer thread
+summit_lock = threading.Lock()
+# (association, region) -> time when a spot from the region was last seen
+seen_regions = {}
 
 
 class PropMixin:
@@ -29,10 +39,24 @@ class PropMixin:
     def distance(self):
         """Measure distance with respect to own coordinates (from the env)"""
 
+        distance = getattr(self, 'distance_', None)
+        if distance is not None:
+            return distance
         if self.latitude is not None and self.longitude is not None:
             return haversine.haversine((MY_LATITUDE, MY_LONGITUDE), (self.latitude, self.longitude))
         return None
 
+    @property
+    def bearing(self):
+        """Initial bearing in degrees from own coordinates (from the env)"""
+
+        bearing = getattr(self, 'bearing_', None)
+        if bearing is not None:
+            return bearing
+        if self.latitude is not None and self.longitude is not None:
+            return grid.distance_bearing((MY_LATITUDE, MY_LONGITUDE), (self.latitude, self.longitude))[1]
+        return None
+
     @property
     def programme(self):
         """Guess programme based on the comment parameter"""
@@ -55,8 +79,16 @@ class PropMixin:
         try:
             return getattr(self, 'locator_')
         except AttributeError:
+            if self.latitude is None or self.longitude is None:
+                return ''
             return maidenhead.to_maiden(self.latitude, self.longitude, 3)
 
+    @property
+    def entity(self):
+        """DXCC entity (country, zones, continent) of the activator"""
+
+        return lookup(self.activator)
+
 
 class POTA(BaseModel, PropMixin):
     frequency: float
@@ -83,16 +115,33 @@ class POTA(BaseModel, PropMixin):
         return dt.astimezone(timezone.utc)
 
 
-def store_summits(db, country, region):
-    """Get missing summit info and store in the shelve cache"""
+def fetch_summits(country, region, session=None):
+    """
+    Download summit info of the region, None if not available;
+    the connection pool is shared with the fetch backend.
+    """
 
-    response = requests.get(SOTA_REGION_URL.format(country, region), timeout=API_TIMEOUT)
+    response = (session or http_session).get(SOTA_REGION_URL.format(country, region), timeout=API_TIMEOUT)
     if response.status_code != 200:
         logger.debug("Failed to get summit codes")
-        return
-    data = response.json()
-    for summit in data['summits']:
+        return None
+    return response.json()['summits']
+
+
+def save_summits(db, country, region, summits):
+    """Store summits in the shelve cache and remember when the region was fetched"""
+
+    for summit in summits:
         db[summit['summitCode']] = summit['locator'], summit['latitude'], summit['longitude']
+    db[REGION_KEY.format(country, region)] = time.time()
+
+
+def store_summits(db, country, region):
+    """Get missing summit info and store in the shelve cache"""
+
+    summits = fetch_summits(country, region)
+    if summits is not None:
+        save_summits(db, country, region, summits)
 
 
 def get_coordinates_from_summit_code(summit):
@@ -101,10 +150,12 @@ def get_coordinates_from_summit_code(summit):
     call API if not found.
     """
 
-    with shelve.open(SHELVE_PATH) as db:
+    match = summit_re.match(summit)
+    if match:
+        seen_regions[match.group("country"), match.group("region")] = time.time()
+    with summit_lock, shelve.open(SHELVE_PATH) as db:
         if summit not in db:
             logger.debug("Summit {} not found locally", summit)
-            match = summit_re.match(summit)
             if match:
                 store_summits(db, match.group("country"), match.group("region"))
         return db.get(summit, (None, None, None))
@@ -164,8 +215,8 @@ class DXSummit(BaseModel, PropMixin):
     timestamp: datetime = Field(alias='time')
     comment: Optional[str] = Field(alias='info')
     mode: str = Field(default='')
-    latitude: float = Field(alias='dx_latitude')
-    longitude: float = Field(alias='dx_longitude')
+    latitude: Optional[float] = Field(alias='dx_latitude', default=None)
+    longitude: Optional[float] = Field(alias='dx_longitude', default=None)
     origin: str = 'DXSummit'
 
     @field_validator('timestamp', mode='before')
@@ -194,13 +245,22 @@ class DXHeat(BaseModel, PropMixin):
     comment: str = Field(alias='Comment')
     latitude: float = None
     longitude: float = None
+    distance_: Optional[float] = None
+    bearing_: Optional[float] = None
     origin: str = 'DXHeat'
 
     @model_validator(mode="after")
     def get_coordinates_from_locator(self):
+        """Take centre, distance and bearing of the locator square from the precomputed table"""
+
         if not self.locator:
             return self
-        self.latitude, self.longitude = maidenhead.to_location(self.locator_)
+        try:
+            square = grid.lookup(self.locator_)
+        except ValueError:
+            logger.debug("Invalid locator {} of {}", self.locator_, self.activator)
+            return self
+        self.latitude, self.longitude, self.distance_, self.bearing_ = square
         return self
 
     @field_validator('mode', mode='before')
@@ -0,0 +1,151 @@
+"""
+Background filling of the SOTA summit cache, so that parsing spots
+rarely has to wait for the summit API
+"""
+
+import shelve
+import threading
+import time
+
+import haversine
+
+from ft_891_hunter import models
+from ft_891_hunter.config import (API_TIMEOUT, MY_LATITUDE, MY_LONGITUDE, SUMMIT_MAX_AGE,
+                                  SUMMIT_PREWARM_RADIUS, SUMMIT_REQUEST_INTERVAL)
+from ft_891_hunter.fetch import http_session
+from ft_891_hunter.log import logger
+
+SOTA_ASSOCIATIONS_URL = "https://api-db2.sota.org.uk/api/associations"
+SOTA_ASSOCIATION_URL = "https://api-db2.sota.org.uk/api/associations/{}"
+ASSOCIATIONS_KEY = "associations"
+ASSOCIATION_KEY = "association:{}"
+
+
+def distance_to_area(origin, area):
+    """
+    Distance in km from origin to the nearest point of the bounding box
+    of an association or region, None if the API gave no bounds
+    """
+
+    try:
+        lat = min(max(origin[0], area['minLat']), area['maxLat'])
+        lon = min(max(origin[1], area['minLong']), area['maxLong'])
+    except (KeyError, TypeError):
+        return None
+    return haversine.haversine(origin, (lat, lon))
+
+
+class SummitPrewarmer:
+    """
+    Fetch summits of regions near own station and of regions seen recently
+    into the summit cache; one request per interval seconds at most.
+    Regions are refetched once older than max_age seconds, so an interrupted run
+    resumes where it stopped.
+    """
+
+    def __init__(self, origin=(MY_LATITUDE, MY_LONGITUDE), radius=SUMMIT_PREWARM_RADIUS,
+                 max_age=SUMMIT_MAX_AGE, interval=SUMMIT_REQUEST_INTERVAL,
+                 session=None, sleep=time.sleep, clock=time.time):
+        self.origin = origin
+        self.radius = radius
+        self.max_age = max_age
+        self.interval = interval
+        self.session = session or http_session
+        self.sleep = sleep
+        self.clock = clock
+        self.last_request = None
+        self.thread = None
+
+    def start(self):
+        """Run in a background thread, unless the previous run is still going"""
+
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self.run, name="SummitPrewarmer", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        try:
+            regions = self.regions()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to list SOTA regions: {}", exc)
+            return
+        fetched = 0
+        for country, region in regions:
+            if not self.is_stale(models.REGION_KEY.format(country, region)):
+                continue
+            self.throttle()
+            try:
+                summits = models.fetch_summits(country, region, self.session)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.warning("Failed to get summits of {}/{}: {}", country, region, exc)
+                continue
+            if summits is not None:
+                with models.summit_lock, shelve.open(models.SHELVE_PATH) as db:
+                    models.save_summits(db, country, region, summits)
+                fetched += 1
+        logger.info("Summit cache prewarmed, {} regions fetched", fetched)
+
+    def regions(self):
+        """Regions seen recently first, then those already cached and those near own station"""
+
+        seen = dict(models.seen_regions)
+        regions = dict.fromkeys(sorted(seen, key=seen.get, reverse=True))
+        with models.summit_lock, shelve.open(models.SHELVE_PATH) as db:
+            cached = [key for key in db.keys() if key.startswith("region:")]
+        for key in cached:
+            country, region = key.removeprefix("region:").split('/')
+            regions[country, region] = None
+        for region in self.nearby_regions():
+            regions[region] = None
+        return list(regions)
+
+    def nearby_regions(self):
+        """(association, region) pairs with any part within radius of own station, nearest first"""
+
+        if not self.radius:
+            return []
+        nearby = []
+        for association in self.get_cached(ASSOCIATIONS_KEY, SOTA_ASSOCIATIONS_URL):
+            distance = distance_to_area(self.origin, association)
+            if distance is None or distance > self.radius:
+                continue
+            code = association['associationCode']
+            details = self.get_cached(ASSOCIATION_KEY.format(code), SOTA_ASSOCIATION_URL.format(code))
+            for region in details.get('regions') or []:
+                distance = distance_to_area(self.origin, region)
+                if distance is not None and distance <= self.radius:
+                    nearby.append((distance, code, region['regionCode']))
+        return [(code, region) for _, code, region in sorted(nearby)]
+
+    def get_cached(self, key, url):
+        """JSON from the API, kept in the summit cache together with the time of download"""
+
+        with models.summit_lock, shelve.open(models.SHELVE_PATH) as db:
+            cached = db.get(key)
+        if cached and not self.is_expired(cached[0]):
+            return cached[1]
+        self.throttle()
+        response = self.session.get(url, timeout=API_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        with models.summit_lock, shelve.open(models.SHELVE_PATH) as db:
+            db[key] = self.clock(), data
+        return data
+
+    def is_stale(self, key):
+        with models.summit_lock, shelve.open(models.SHELVE_PATH) as db:
+            fetched = db.get(key)
+        return fetched is None or self.is_expired(fetched)
+
+    def is_expired(self, fetched):
+        return self.clock() - fetched > self.max_age
+
+    def throttle(self):
+        """Keep at least interval seconds between requests"""
+
+        if self.last_request is not None:
+            wait = self.last_request + self.interval - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+        self.last_request = self.clock()
@@ -0,0 +1,230 @@
+"""
+Opt-in profiling of the GUI thread and of each worker QThread
+(a profile only sees the thread it was enabled in), plus logging of slow GUI event handlers
+"""
+
+import cProfile
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+from PyQt6.QtWidgets import QApplication  # pylint: disable=E0401,E0611
+
+from ft_891_hunter.config import PROFILE, PROFILE_CYCLES, cache_dir
+from ft_891_hunter.log import logger
+
+STOP_TIMEOUT = 2
+
+
+class ThreadProfile:
+    """
+    Deterministic profile of the thread which enables it, recorded with sys.setprofile
+    and dumped in pstats format. Used from Python 3.12, where cProfile runs on sys.monitoring,
+    which allows one profile at a time and records events of all threads in it.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.frames = []
+        self.depth = Counter()
+        self.entries = {}
+        self.stats = {}
+
+    def enable(self):
+        sys.setprofile(self.dispatch)
+
+    def disable(self):
+        sys.setprofile(None)
+        self.frames.clear()
+        self.depth.clear()
+
+    def dispatch(self, frame, event, arg):
+        if event == 'call':
+            code = frame.f_code
+            self.push((code.co_filename, code.co_firstlineno, code.co_name))
+        elif event == 'c_call':
+            self.push(('~', 0, f"<built-in method {getattr(arg, '__qualname__', arg)}>"))
+        elif self.frames:
+            self.pop()
+
+    def push(self, key):
+        self.frames.append([key, self.clock(), 0.0])
+        self.depth[key] += 1
+
+    def pop(self):
+        """Account a finished call to the function and to the edge from its caller"""
+
+        key, start, children = self.frames.pop()
+        elapsed = self.clock() - start
+        self.depth[key] -= 1
+        own = elapsed - children
+        primitive = not self.depth[key]
+        entry = self.entries.setdefault(key, [0, 0, 0.0, 0.0, {}])
+        targets = [entry]
+        if self.frames:
+            self.frames[-1][2] += elapsed
+            targets.append(entry[4].setdefault(self.frames[-1][0], [0, 0, 0.0, 0.0]))
+        for target in targets:
+            target[0] += primitive
+            target[1] += 1
+            target[2] += own
+            target[3] += elapsed if primitive else 0.0
+
+    def create_stats(self):
+        self.stats = {
+            key: (cc, nc, tt, ct, {caller: tuple(edge) for caller, edge in callers.items()})
+            for key, (cc, nc, tt, ct, callers) in self.entries.items()
+        }
+
+    def dump_stats(self, path):
+        self.create_stats()
+        with open(path, 'wb') as stats:
+            marshal.dump(self.stats, stats)
+
+
+Profile = cProfile.Profile if sys.version_info < (3, 12) else ThreadProfile
+
+
+class ProfileStarter(QObject):
+    """Lives in the profiled thread, so that the profile is enabled and disabled there"""
+
+    stop_requested = pyqtSignal()
+
+    def __init__(self, profile):
+        super().__init__()
+        self.profile = profile
+        self.active = False
+        self.stopped = threading.Event()
+        self.stop_requested.connect(self.stop)
+
+    @pyqtSlot()
+    def start(self):
+        try:
+            self.profile.enable()
+        except ValueError as exc:
+            logger.warning("Cannot profile thread {}: {}", threading.current_thread().name, exc)
+            return
+        self.active = True
+        self.stopped.clear()
+
+    @pyqtSlot()
+    def stop(self):
+        if self.active:
+            self.profile.disable()
+            self.active = False
+        self.stopped.set()
+
+
+class ProfiledThread(QThread):
+    """
+    Runs its event loop from Python, so that one Python thread state, with the profile enabled,
+    serves every slot called in the thread
+    """
+
+    def __init__(self, starter):
+        super().__init__()
+        self.starter = starter
+
+    def run(self):
+        self.starter.start()
+        self.exec()
+        self.starter.stop()
+
+
+class ThreadProfiler(QObject):
+    """
+    One profile per thread name; profiles are dumped in pstats format
+    into path when the application quits or after the given number of refresh cycles.
+    """
+
+    def __init__(self, path=cache_dir, cycles=PROFILE_CYCLES, enabled=PROFILE, profile_class=Profile):
+        super().__init__()
+        self.profile_class = profile_class
+        self.path = path
+        self.cycles = cycles
+        self.enabled = enabled
+        self.profiles = {}
+        self.starters = []
+        self.count = 0
+        self.done = False
+
+    def thread(self, name):
+        """New QThread, profiled from its start until it finishes or profiling ends"""
+
+        if not self.enabled or self.done:
+            return QThread()
+        starter = ProfileStarter(self.profiles.setdefault(name, self.profile_class()))
+        thread = ProfiledThread(starter)
+        starter.moveToThread(thread)
+        self.starters.append(starter)
+        return thread
+
+    def start_here(self, name):
+        """Profile the calling thread (the GUI) from now on"""
+
+        if not self.enabled or self.done:
+            return
+        starter = ProfileStarter(self.profiles.setdefault(name, self.profile_class()))
+        starter.start()
+        self.starters.append(starter)
+
+    @pyqtSlot()
+    def cycle_finished(self):
+        self.count += 1
+        if self.count == self.cycles:
+            logger.info("Profiled {} refresh cycles", self.count)
+            self.finish()
+
+    @pyqtSlot()
+    def finish(self):
+        """Stop profiling in every thread and dump one file per thread"""
+
+        if not self.enabled or self.done:
+            return
+        self.done = True
+        active = [starter for starter in self.starters if starter.active]
+        for starter in active:
+            starter.stop_requested.emit()
+        for starter in active:
+            if not starter.stopped.wait(STOP_TIMEOUT):
+                logger.warning("Profiled thread did not stop in {} s", STOP_TIMEOUT)
+        running = {id(starter.profile) for starter in self.starters if starter.active}
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        for name, profile in self.profiles.items():
+            if id(profile) in running:
+                continue
+            path = os.path.join(self.path, f"profile-{stamp}-{name}.pstats")
+            profile.dump_stats(path)
+            logger.info("Profile of {} thread saved to {}", name, path)
+
+
+class ProfilingApplication(QApplication):
+    """Log events of the GUI thread which take longer than threshold ms to handle"""
+
+    def __init__(self, argv, threshold):
+        super().__init__(argv)
+        self.threshold = threshold / 1000
+        self.gui_thread = threading.get_ident()
+        self.depth = 0
+
+    def notify(self, receiver, event):  # pylint: disable=invalid-name
+        if threading.get_ident() != self.gui_thread:
+            return super().notify(receiver, event)
+        kind = event.type()
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            return super().notify(receiver, event)
+        finally:
+            self.depth -= 1
+            elapsed = time.perf_counter() - start
+            if elapsed > self.threshold and not self.depth:
+                logger.warning("Slow frame: {} event of {} took {:.0f} ms",
+                               kind.name, type(receiver).__name__, elapsed * 1000)
+
+
+profiler = ThreadProfiler()
@@ -0,0 +1,54 @@
+"""Recording raw API responses into an archive and replaying them without network"""
+
+import gzip
+import json
+import time
+import zlib
+
+from ft_891_hunter.log import logger
+
+
+class Recorder:
+    """
+    Append raw payloads to a gzip archive, one timestamped JSON line per response;
+    every record is a separate gzip member, so the file stays readable after a crash.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def record(self, name, data, timestamp=None):
+        record = {'t': time.time() if timestamp is None else timestamp, 'name': name, 'data': data}
+        with gzip.open(self.path, "at", encoding="utf-8") as archive:
+            archive.write(json.dumps(record, separators=(',', ':')) + "\n")
+
+
+def read_archive(path):
+    """Yield (timestamp, name, data) for each recorded response; stop at a truncated tail"""
+
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        try:
+            for line in archive:
+                record = json.loads(line)
+                yield record['t'], record['name'], record['data']
+        except (EOFError, zlib.error, json.JSONDecodeError):
+            logger.warning("Archive {} is truncated, stopping replay", path)
+
+
+def replay(path, store_spots, speed=1.0, sleep=time.sleep):
+    """
+    Feed recorded responses to store_spots keeping the original spacing in time,
+    scaled down by speed; speed of 0 replays as fast as possible.
+    Payloads are (name, data, recording time), so spot ages are measured against the recording.
+    """
+
+    count = 0
+    previous = None
+    for timestamp, name, data in read_archive(path):
+        if previous is not None and speed > 0:
+            sleep(max(timestamp - previous, 0) / speed)
+        previous = timestamp
+        store_spots((name, data, timestamp))
+        count += 1
+    logger.info("Replayed {} responses from {}", count, path)
+    return count
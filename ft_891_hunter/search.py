@@ -0,0 +1,104 @@
+"""Index of stored spots for type-ahead search by callsign, reference and comment"""
+
+import itertools
+import re
+from bisect import bisect_left, insort
+
+from ft_891_hunter.cty import base_call
+from ft_891_hunter.store import spot_key
+
+token_re = re.compile(r"[^\s,;:!?()\"']+")
+LAST = '\uffff'
+
+
+class SearchIndex:
+    """
+    Activators (also without portable prefixes and suffixes) and references are kept
+    in a sorted array of (term, id) searched by prefix with bisect; comment tokens map
+    to sets of ids, with a sorted array of the tokens for prefix search.
+    Spots are added and removed one by one, following the deltas of the spot store.
+    """
+
+    def __init__(self):
+        self.terms = []
+        self.tokens = {}
+        self.token_list = []
+        self.entries = {}
+        self.keys = {}
+        self.ids = itertools.count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def update(self, added=(), removed=()):
+        for spot in removed:
+            self.remove(spot_key(spot))
+        for spot in added:
+            self.add(spot)
+
+    def add(self, spot):
+        key = spot_key(spot)
+        if key in self.entries:
+            return
+        ident = next(self.ids)
+        activator = spot.activator.upper()
+        terms = {activator, base_call(activator)}
+        reference = (getattr(spot, 'reference', '') or '').upper()
+        if reference:
+            terms.add(reference)
+        tokens = set(token_re.findall((spot.comment or '').upper()))
+        for term in terms:
+            insort(self.terms, (term, ident))
+        for token in tokens:
+            if token not in self.tokens:
+                self.tokens[token] = set()
+                insort(self.token_list, token)
+            self.tokens[token].add(ident)
+        self.entries[key] = (ident, terms, tokens)
+        self.keys[ident] = key
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        ident, terms, tokens = entry
+        del self.keys[ident]
+        for term in terms:
+            del self.terms[bisect_left(self.terms, (term, ident))]
+        for token in tokens:
+            ids = self.tokens[token]
+            ids.discard(ident)
+            if not ids:
+                del self.tokens[token]
+                del self.token_list[bisect_left(self.token_list, token)]
+
+    def ident(self, key):
+        """Id of the spot with the key, None if it is not indexed"""
+
+        entry = self.entries.get(key)
+        return entry[0] if entry else None
+
+    def match(self, word):
+        """Ids of spots with an activator, reference or comment token starting with the word"""
+
+        start = bisect_left(self.terms, (word,))
+        end = bisect_left(self.terms, (word + LAST,), start)
+        ids = {ident for _, ident in self.terms[start:end]}
+        start = bisect_left(self.token_list, word)
+        end = bisect_left(self.token_list, word + LAST, start)
+        for token in self.token_list[start:end]:
+            ids |= self.tokens[token]
+        return ids
+
+    def search(self, text):
+        """Ids of the spots matching every word of the text, None if there are no words"""
+
+        words = text.upper().split()
+        if not words:
+            return None
+        found = None
+        for word in words:
+            found = self.match(word) if found is None else found & self.match(word)
+            if not found:
+                return set()
+        return found
@@ -0,0 +1,291 @@
+"""
+Map of the filtered spots around own station, in azimuthal equidistant projection;
+only the visible part is drawn and dense areas are clustered
+"""
+
+import math
+from collections import defaultdict
+
+from PyQt6.QtCore import QRectF, Qt, QTimer, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QBrush, QColor, QPainter, QPen
+from PyQt6.QtWidgets import (QGraphicsEllipseItem, QGraphicsItem,  # pylint: disable=E0401,E0611
+                             QGraphicsScene, QGraphicsSimpleTextItem, QGraphicsView)
+
+from ft_891_hunter.store import spot_key
+from ft_891_hunter.worker import SpotTableUpdater
+
+HALF_CIRCUMFERENCE = 20038
+CELL_SIZE = 500
+RING_STEP = 2500
+
+
+def project(distance, bearing):
+    """Scene position (km east, km south) of a point at distance km and bearing from own station"""
+
+    angle = math.radians(bearing)
+    return distance * math.sin(angle), -distance * math.cos(angle)
+
+
+class GridIndex:
+    """Points bucketed into square cells of the given size, so a rectangle is queried without a full scan"""
+
+    def __init__(self, cell=CELL_SIZE):
+        self.cell = cell
+        self.cells = defaultdict(dict)
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def insert(self, key, x, y, value):
+        """Add or move the point; returns its cell"""
+
+        self.remove(key)
+        cell = int(x // self.cell), int(y // self.cell)
+        self.cells[cell][key] = (x, y, value)
+        self.positions[key] = cell
+        return cell
+
+    def remove(self, key):
+        """Drop the point; returns the cell it was in, None if it was not indexed"""
+
+        cell = self.positions.pop(key, None)
+        if cell is not None:
+            points = self.cells[cell]
+            del points[key]
+            if not points:
+                del self.cells[cell]
+        return cell
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+
+    def points(self):
+        """(key, x, y, value) of every point"""
+
+        for points in self.cells.values():
+            for key, (x, y, value) in points.items():
+                yield key, x, y, value
+
+    def cell_range(self, left, top, right, bottom):
+        """(columns, rows) of the cells overlapping the rectangle"""
+
+        return (range(int(left // self.cell), int(right // self.cell) + 1),
+                range(int(top // self.cell), int(bottom // self.cell) + 1))
+
+    def cells_in(self, left, top, right, bottom):
+        """{cell: {key: (x, y, value)}} of the non-empty cells overlapping the rectangle"""
+
+        columns, rows = self.cell_range(left, top, right, bottom)
+        if len(columns) * len(rows) > len(self.cells):
+            return {cell: points for cell, points in self.cells.items() if cell[0] in columns and cell[1] in rows}
+        return {(col, row): self.cells[col, row] for col in columns for row in rows if (col, row) in self.cells}
+
+    def query(self, left, top, right, bottom):
+        """(x, y, value) of the points within the rectangle"""
+
+        for points in self.cells_in(left, top, right, bottom).values():
+            for x, y, value in points.values():
+                if left <= x <= right and top <= y <= bottom:
+                    yield x, y, value
+
+
+class SpotMap(QGraphicsView):
+    """
+    Spots are kept in a grid index by their projected position, and for every zoom level visited
+    in a grid of cluster cells, at least cluster_pixels wide on screen. Both are updated from
+    spot deltas, with the same filter as the table. There is one item per visible cluster cell;
+    items are replaced only when the zoom level changes, the view reaches other cells
+    or the spots of their cell change.
+    """
+
+    spot_clicked = pyqtSignal(int)
+    cluster_pixels = 24
+    point_radius = 5
+    point_color = QColor("#4fc3f7")
+    cluster_color = QColor("#ff9800")
+    ring_color = QColor("#555555")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setScene(QGraphicsScene(self))
+        self.scene().setSceneRect(QRectF(
+            -HALF_CIRCUMFERENCE, -HALF_CIRCUMFERENCE, 2 * HALF_CIRCUMFERENCE, 2 * HALF_CIRCUMFERENCE
+        ))
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.index = GridIndex()
+        self.levels = {}
+        self.level = None
+        self.shown = None
+        self.dirty = set()
+        self.spot_items = {}
+        self.fitted = False
+        self.draw_background()
+
+        self.layout_timer = QTimer(self)
+        self.layout_timer.setSingleShot(True)
+        self.layout_timer.setInterval(30)
+        self.layout_timer.timeout.connect(self.relayout)
+
+    def draw_background(self):
+        pen = QPen(self.ring_color)
+        pen.setCosmetic(True)
+        for radius in range(RING_STEP, HALF_CIRCUMFERENCE + 1, RING_STEP):
+            self.scene().addEllipse(-radius, -radius, 2 * radius, 2 * radius, pen)
+        self.scene().addLine(-HALF_CIRCUMFERENCE, 0, HALF_CIRCUMFERENCE, 0, pen)
+        self.scene().addLine(0, -HALF_CIRCUMFERENCE, 0, HALF_CIRCUMFERENCE, pen)
+
+    @pyqtSlot(dict)
+    def set_spots(self, spots):
+        """Rebuild the indexes from a snapshot of the store, e.g. after the filters have changed"""
+
+        self.index.clear()
+        self.levels.clear()
+        self.clear_items()
+        self.add_spots(spot for source in spots.values() for spot in source)
+        self.schedule()
+
+    @pyqtSlot(list, list)
+    def update_spots(self, added, removed):
+        for spot in removed:
+            key = spot_key(spot)
+            self.index.remove(key)
+            for level, clusters in self.levels.items():
+                self.mark_dirty(level, clusters.remove(key))
+        self.add_spots(added)
+        self.schedule()
+
+    def add_spots(self, spots):
+        for spot in SpotTableUpdater.filter_spots(spots):
+            distance, bearing = spot.distance, spot.bearing
+            if distance is None or bearing is None:
+                continue
+            key, (x, y) = spot_key(spot), project(distance, bearing)
+            self.index.insert(key, x, y, spot)
+            for level, clusters in self.levels.items():
+                self.mark_dirty(level, clusters.insert(key, x, y, spot))
+
+    def mark_dirty(self, level, cell):
+        if level == self.level and cell is not None:
+            self.dirty.add(cell)
+
+    def zoom_level(self):
+        """Cluster cells are 2 ** level km wide, the smallest power of two of at least cluster_pixels"""
+
+        return math.ceil(math.log2(self.cluster_pixels / self.transform().m11()))
+
+    def clusters(self, level):
+        """Grid of cluster cells of the zoom level, built from the spot index on the first visit"""
+
+        if level not in self.levels:
+            clusters = self.levels[level] = GridIndex(2.0 ** level)
+            for key, x, y, spot in self.index.points():
+                clusters.insert(key, x, y, spot)
+        return self.levels[level]
+
+    def clear_items(self):
+        for item in self.spot_items.values():
+            self.scene().removeItem(item)
+        self.spot_items.clear()
+        self.dirty.clear()
+        self.shown = None
+
+    def schedule(self):
+        """Relayout soon, at most once per timer interval"""
+
+        if self.isVisible() and not self.layout_timer.isActive():
+            self.layout_timer.start()
+
+    def relayout(self):
+        """Show the clusters of the visible cells, keeping the items of cells that are still visible and unchanged"""
+
+        level = self.zoom_level()
+        if level != self.level:
+            self.clear_items()
+            self.level = level
+        clusters = self.clusters(level)
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        rect = visible.left(), visible.top(), visible.right(), visible.bottom()
+        shown = clusters.cell_range(*rect)
+        if shown == self.shown and not self.dirty:
+            return
+        self.shown = shown
+        cells = clusters.cells_in(*rect)
+        for cell in [cell for cell in self.spot_items if cell not in cells or cell in self.dirty]:
+            self.scene().removeItem(self.spot_items.pop(cell))
+        self.dirty.clear()
+        for cell, points in cells.items():
+            if cell not in self.spot_items:
+                self.spot_items[cell] = self.make_item(list(points.values()))
+
+    def make_item(self, points):
+        """Point or cluster item at the mean position of the (x, y, spot) points"""
+
+        spots = [spot for _, _, spot in points]
+        item = self.make_point(spots[0]) if len(spots) == 1 else self.make_cluster(spots)
+        item.setPos(sum(x for x, _, _ in points) / len(points), sum(y for _, y, _ in points) / len(points))
+        item.setData(0, spots)
+        item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIgnoresTransformations)
+        self.scene().addItem(item)
+        return item
+
+    def make_point(self, spot):
+        radius = self.point_radius
+        item = QGraphicsEllipseItem(-radius, -radius, 2 * radius, 2 * radius)
+        item.setBrush(QBrush(self.point_color))
+        item.setToolTip(f"{spot.activator} {spot.frequency} {spot.mode}")
+        return item
+
+    def make_cluster(self, spots):
+        radius = self.point_radius + 2 * math.log2(len(spots))
+        item = QGraphicsEllipseItem(-radius, -radius, 2 * radius, 2 * radius)
+        item.setBrush(QBrush(self.cluster_color))
+        item.setToolTip(", ".join(spot.activator for spot in spots[:10]) + (" ..." if len(spots) > 10 else ""))
+        label = QGraphicsSimpleTextItem(str(len(spots)), item)
+        label.setPos(-label.boundingRect().width() / 2, -label.boundingRect().height() / 2)
+        return item
+
+    def mousePressEvent(self, event):  # pylint: disable=invalid-name
+        """Tune to a clicked spot, zoom into a clicked cluster"""
+
+        item = self.itemAt(event.position().toPoint())
+        spots = item.topLevelItem().data(0) if item else None
+        if not spots or event.button() != Qt.MouseButton.LeftButton:
+            super().mousePressEvent(event)
+            return
+        if len(spots) == 1:
+            self.spot_clicked.emit(int(round(spots[0].frequency * 1000)))
+        else:
+            self.centerOn(item.topLevelItem())
+            self.scale(2, 2)
+            self.schedule()
+        event.accept()
+
+    def wheelEvent(self, event):  # pylint: disable=invalid-name
+        factor = 1.25 ** (event.angleDelta().y() / 120)
+        self.scale(factor, factor)
+        self.schedule()
+
+    def scrollContentsBy(self, dx, dy):  # pylint: disable=invalid-name
+        super().scrollContentsBy(dx, dy)
+        self.schedule()
+
+    def resizeEvent(self, event):  # pylint: disable=invalid-name
+        super().resizeEvent(event)
+        self.fit_once()
+        self.schedule()
+
+    def showEvent(self, event):  # pylint: disable=invalid-name
+        super().showEvent(event)
+        self.fit_once()
+        self.schedule()
+
+    def fit_once(self):
+        """Show the whole world once the view has got its size"""
+
+        if not self.fitted and self.isVisible() and not self.viewport().rect().isEmpty():
+            self.fitInView(self.scene().sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
+            self.fitted = True
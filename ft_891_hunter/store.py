@@ -0,0 +1,117 @@
+"""Time-windowed storage of spots, grouped by source"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Mapping
+
+
+def spot_key(spot):
+    """Identity of a spot which does not depend on the model instance"""
+
+    return spot.origin, spot.activator, spot.frequency, spot.timestamp
+
+
+class SpotStore(Mapping):
+    """
+    Mapping of API name to the list of its spots, with optional limits on spot age (seconds),
+    spot count per source and spot count overall (0 means no limit).
+    Every source keeps a heap ordered by spot time, so the oldest spots are evicted
+    without scanning. Modifying methods return deltas as (added, removed) lists.
+    """
+
+    def __init__(self, max_age=0, max_per_source=0, max_total=0, clock=time.time):
+        self.max_age = max_age
+        self.max_per_source = max_per_source
+        self.max_total = max_total
+        self.clock = clock
+        self._spots = {}
+        self._heaps = {}
+        self._total = 0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        with self._lock:
+            return list(self._spots[name].values())
+
+    def __iter__(self):
+        return iter(list(self._spots))
+
+    def __len__(self):
+        return len(self._spots)
+
+    def snapshot(self):
+        """Plain dict copy, safe to hand over to another thread"""
+
+        with self._lock:
+            return {name: list(spots.values()) for name, spots in self._spots.items()}
+
+    def replace(self, name, spots):
+        """Swap all spots of the given source for the new ones"""
+
+        new = {spot_key(spot): spot for spot in spots}
+        with self._lock:
+            old = self._spots.get(name, {})
+            added = [spot for key, spot in new.items() if key not in old]
+            removed = [spot for key, spot in old.items() if key not in new]
+            self._spots[name] = new
+            self._total += len(new) - len(old)
+            heap = [(spot.timestamp.timestamp(), next(self._seq), key) for key, spot in new.items()]
+            heapq.heapify(heap)
+            self._heaps[name] = heap
+            return self._apply_limits(added, removed)
+
+    def add(self, name, spots):
+        """Merge spots into the given source, for sources which stream new spots only"""
+
+        with self._lock:
+            current = self._spots.setdefault(name, {})
+            heap = self._heaps.setdefault(name, [])
+            added = []
+            for spot in spots:
+                key = spot_key(spot)
+                if key not in current:
+                    heapq.heappush(heap, (spot.timestamp.timestamp(), next(self._seq), key))
+                    added.append(spot)
+                current[key] = spot
+            self._total += len(added)
+            return self._apply_limits(added, [])
+
+    def evict(self):
+        """Drop spots which exceed the limits; return the removed spots"""
+
+        with self._lock:
+            return self._evict()
+
+    def _apply_limits(self, added, removed):
+        evicted = self._evict()
+        if evicted:
+            gone = {spot_key(spot) for spot in evicted}
+            new = {spot_key(spot) for spot in added}
+            added = [spot for spot in added if spot_key(spot) not in gone]
+            removed = removed + [spot for spot in evicted if spot_key(spot) not in new]
+        return added, removed
+
+    def _evict(self):
+        evicted = []
+        if self.max_age:
+            cutoff = self.clock() - self.max_age
+            for name, heap in self._heaps.items():
+                while heap and heap[0][0] < cutoff:
+                    evicted.append(self._pop_oldest(name))
+        if self.max_per_source:
+            for name, spots in self._spots.items():
+                while len(spots) > self.max_per_source:
+                    evicted.append(self._pop_oldest(name))
+        if self.max_total:
+            while self._total > self.max_total:
+                _, name = min((heap[0][0], name) for name, heap in self._heaps.items() if heap)
+                evicted.append(self._pop_oldest(name))
+        return evicted
+
+    def _pop_oldest(self, name):
+        _, _, key = heapq.heappop(self._heaps[name])
+        self._total -= 1
+        return self._spots[name].pop(key)
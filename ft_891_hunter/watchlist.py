@@ -0,0 +1,139 @@
+"""
+Watchlist of activators, references, callsign prefixes and comment keywords,
+compiled into hashed sets and automata, so a spot is matched in a single pass
+"""
+
+import os
+from collections import deque
+
+from ft_891_hunter.cty import base_call
+from ft_891_hunter.log import logger
+
+KINDS = ('call', 'ref', 'prefix', 'keyword')
+
+
+class AhoCorasick:
+    """Find all of the given patterns occurring in a text, in one pass over the text"""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [set()]
+        for pattern in patterns:
+            self._add(pattern)
+        self._link()
+
+    def _add(self, pattern):
+        node = 0
+        for char in pattern:
+            if char not in self.goto[node]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(set())
+                self.goto[node][char] = len(self.goto) - 1
+            node = self.goto[node][char]
+        self.output[node].add(pattern)
+
+    def _link(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fail = self.fail[node]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[child] = self.goto[fail].get(char, 0)
+                self.output[child] |= self.output[self.fail[child]]
+
+    def search(self, text, whole_words=False):
+        """
+        Return the set of patterns found in the text; with whole_words, only patterns
+        not preceded or followed by a letter or digit (CW in "CW QRS", not in "CWOPS")
+        """
+
+        found = set()
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            if not whole_words:
+                found |= self.output[node]
+                continue
+            for pattern in self.output[node]:
+                if is_boundary(text, end - len(pattern) - 1) and is_boundary(text, end):
+                    found.add(pattern)
+        return found
+
+
+def is_boundary(text, pos):
+    """True if there is no letter or digit at pos, e.g. before the start or after the end of the text"""
+
+    return not 0 <= pos < len(text) or not text[pos].isalnum()
+
+
+class Watchlist:
+    """
+    Exact calls and references are kept in sets, callsign prefixes in a trie
+    and references and keywords searched for in comments, as whole words, in an Aho-Corasick automaton.
+    """
+
+    def __init__(self, calls=(), refs=(), prefixes=(), keywords=()):
+        self.calls = {call.upper() for call in calls}
+        self.refs = {ref.upper() for ref in refs}
+        self.prefixes = {}
+        for prefix in prefixes:
+            node = self.prefixes
+            for char in prefix.upper():
+                node = node.setdefault(char, {})
+            node[None] = prefix.upper()
+        self.keywords = {keyword.upper() for keyword in keywords}
+        self.comments = AhoCorasick(self.refs | self.keywords)
+
+    def __bool__(self):
+        return bool(self.calls or self.refs or self.prefixes or self.keywords)
+
+    @classmethod
+    def load(cls, path):
+        """Read lines like 'call SP9WLG', 'ref SE-0375', 'prefix VK9' or 'keyword IOTA'; # starts a comment"""
+
+        entries = {kind: [] for kind in KINDS}
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as watchlist:
+            for number, line in enumerate(watchlist, 1):
+                kind, _, value = line.split('#', 1)[0].strip().partition(' ')
+                if not kind:
+                    continue
+                if kind not in entries or not value.strip():
+                    logger.warning("Ignoring line {} of {}: {}", number, path, line.strip())
+                    continue
+                entries[kind].append(value.strip())
+        return cls(entries['call'], entries['ref'], entries['prefix'], entries['keyword'])
+
+    def match_prefix(self, callsign):
+        node = self.prefixes
+        for char in callsign:
+            node = node.get(char)
+            if node is None:
+                return None
+            if None in node:
+                return node[None]
+        return None
+
+    def match(self, spot):
+        """Return the list of watchlist entries matching the spot (empty if none)"""
+
+        activator = spot.activator.upper()
+        found = []
+        if activator in self.calls or base_call(activator) in self.calls:
+            found.append(activator)
+        reference = (getattr(spot, 'reference', '') or '').upper()
+        if reference in self.refs:
+            found.append(reference)
+        prefix = self.match_prefix(activator)
+        if prefix:
+            found.append(prefix)
+        found.extend(sorted(self.comments.search((spot.comment or '').upper(), whole_words=True) - {reference}))
+        return found
@@ -2,7 +2,10 @@
 
 import itertools
 import json
+import threading
+import time
 from collections import namedtuple
+from functools import partial
 from typing import Iterable
 
 import humanize
@@ -10,65 +13,241 @@ from PyQt6.QtCore import QObject, QThread, QTimer, QUrl, pyqtSignal, pyqtSlot
 from PyQt6.QtNetwork import (QNetworkAccessManager, QNetworkReply,
                              QNetworkRequest)
 
+from ft_891_hunter.activity import ActivityAggregator
+from ft_891_hunter.bandplan import band, infer_mode
+from ft_891_hunter.jsonstream import JsonArrayParser
 from ft_891_hunter.log import logger
 from ft_891_hunter.models import POTA, SOTA, DXHeat, DXSummit
-from ft_891_hunter.config import PREFERRED_BANDS, PREFERRED_MODES
+from ft_891_hunter.config import (API_URLS, EVICT_PERIOD, MIN_REFRESH_INTERVAL, PREFERRED_BANDS,
+                                  PREFERRED_MODES, REFRESH_DEADLINE, RECORD_PATH, REPLAY_PATH, REPLAY_SPEED,
+                                  SPOT_MAX_AGE, SPOT_MAX_PER_SOURCE, SPOT_MAX_TOTAL, WATCHLIST_PATH)
+from ft_891_hunter.replay import Recorder, replay
+from ft_891_hunter.store import SpotStore, spot_key
+from ft_891_hunter.watchlist import Watchlist
 
 
 SpotData = namedtuple(
         "SpotData",
         ['idx', 'timestamp', 'frequency', 'mode', 'programme', 'reference',
-         'activator', 'comment', 'locator', 'distance', 'origin']
+         'activator', 'comment', 'locator', 'distance', 'origin', 'key']
 )
 
 
 class SpotHandler(QObject):
     models = {'pota': POTA, 'sota': SOTA, 'dxsummit': DXSummit, 'dxheat': DXHeat}
-    band_ranges = {
-        '80m': (3500, 3800),
-        '40m': (7000, 7200),
-        '30m': (10100, 10150),
-        '20m': (14000, 14350),
-        '15m': (21000, 21450),
-        '10m': (28000, 29700),
-        '6m': (50000, 52000),
-        '2m': (144000, 146000),
-        '70cm': (430000, 440000)
-    }
-    store_finished = pyqtSignal()
+    store_finished = pyqtSignal(str)
+    spots_changed = pyqtSignal(list, list)
+    watch_matched = pyqtSignal(list)
+    activity_changed = pyqtSignal(dict)
 
     def __init__(self):
         super().__init__()
-        self.spots = {}
+        self.replay_time = None
+        self.spots = SpotStore(SPOT_MAX_AGE, SPOT_MAX_PER_SOURCE, SPOT_MAX_TOTAL, clock=self.now)
+        self.activity = ActivityAggregator(clock=self.now)
+        self.streams = {}
+        self.watchlist = Watchlist.load(WATCHLIST_PATH)
 
     @pyqtSlot(tuple)
     def store_spots(self, payload):
         """
         For a given API ID (name), remove existing spots and replace them with new;
         Convert from plain dict into a list of pydantic model instances.
+        Replayed payloads carry the recording time as the third element.
         """
 
-        name, raw_data = payload
+        name, raw_data, *recorded = payload
+        if recorded:
+            self.replay_time = recorded[0]
         data = json.loads(raw_data)
         model = self.models[name]
         spots = [model(**sp) for sp in data]
-        if name in self.spots:
-            del self.spots[name]
-        self.spots[name] = spots
+        self.enrich(spots)
+        self.commit(name, spots)
+
+    def now(self):
+        """Current time, or the time of the response being replayed, so that spot ages follow the recording"""
+
+        return time.time() if self.replay_time is None else self.replay_time
+
+    @pyqtSlot(tuple)
+    def feed_spots(self, payload):
+        """
+        Validate spots from the next chunk of a response which is still downloading;
+        each spot is converted as soon as its JSON object is complete.
+        """
+
+        name, chunk = payload
+        if name not in self.streams:
+            self.streams[name] = (JsonArrayParser(), [])
+        parser, spots = self.streams[name]
+        if parser is None:
+            return
+        try:
+            new = [self.models[name](**sp) for sp in parser.feed(chunk)]
+        except ValueError:
+            logger.exception("Invalid response from {}", name)
+            self.streams[name] = (None, [])
+            return
+        self.enrich(new)
+        spots.extend(new)
+
+    @pyqtSlot(str)
+    def finish_spots(self, name):
+        """The response is complete, replace spots of the source with those collected from chunks"""
+
+        parser, spots = self.streams.pop(name, (JsonArrayParser(), []))
+        try:
+            if parser is None:
+                raise ValueError("Response was rejected")
+            parser.close()
+        except ValueError as exc:
+            logger.warning("Not storing {} spots: {}", name, exc)
+            self.store_finished.emit(name)
+            return
+        self.commit(name, spots)
+
+    @pyqtSlot(str)
+    def discard_spots(self, name):
+        """Drop spots collected from a response which has failed"""
+
+        self.streams.pop(name, None)
+
+    def commit(self, name, spots):
+        """
+        Store validated spots of the source; spots exceeding the age and count limits
+        are evicted and all changes are emitted as deltas.
+        """
+
+        added, removed = self.spots.replace(name, spots)
         logger.debug("Storing {} {} spots", len(self.spots[name]), name)
-        self.store_finished.emit()
+        self.spots_changed.emit(added, removed)
+        self.update_activity(added, removed)
+        self.check_watchlist(added)
+        self.store_finished.emit(name)
+
+    def update_activity(self, added, removed):
+        """Count the delta in the activity aggregates and publish them if a count has changed"""
+
+        if self.activity.update(added, removed):
+            self.activity_changed.emit(self.activity.summary())
+
+    def check_watchlist(self, spots):
+        """Match only new spots against the watchlist, emit (spot, matched entries) pairs"""
+
+        if not self.watchlist:
+            return
+        matched = [(spot, found) for spot in spots if (found := self.watchlist.match(spot))]
+        if matched:
+            logger.info("{} new spots on the watchlist", len(matched))
+            self.watch_matched.emit(matched)
+
+    @staticmethod
+    def enrich(spots):
+        """
+        Fill in what the source left out: the mode from the comment or band plan,
+        coordinates of the activator's DXCC entity
+        """
+
+        for spot in spots:
+            if not spot.mode:
+                spot.mode = infer_mode(spot.frequency, spot.comment)
+            if spot.latitude is not None and spot.longitude is not None:
+                continue
+            entity = spot.entity
+            if entity:
+                spot.latitude, spot.longitude = entity.latitude, entity.longitude
+
+    @pyqtSlot()
+    def evict_spots(self):
+        """Drop expired spots and slide the activity windows even if no source has reported in the meantime"""
+
+        removed = self.spots.evict()
+        if removed:
+            logger.debug("Evicted {} spots", len(removed))
+            self.spots_changed.emit([], removed)
+        self.update_activity([], removed)
+
+
+class RefreshScheduler(QObject):
+    """
+    Coalesce table refreshes of a polling round: refresh as soon as every request
+    of the round has finished, or once the deadline after the first completion expires,
+    but never more often than every min_interval milliseconds.
+    """
+
+    refresh = pyqtSignal()
+
+    def __init__(self, deadline=REFRESH_DEADLINE, min_interval=MIN_REFRESH_INTERVAL, clock=time.monotonic):
+        super().__init__()
+        self.deadline = deadline
+        self.min_interval = min_interval
+        self.clock = clock
+        self.pending = set()
+        self.completed_at = None
+        self.refreshed_at = None
+        self.rendering_since = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.fire)
+
+    def start_round(self, names):
+        """Register requests which the next refresh should wait for"""
+
+        self.pending.update(names)
+
+    def fetched(self):
+        """Mark the moment when data for the next refresh came in"""
+
+        if self.completed_at is None:
+            self.completed_at = self.clock()
+
+    @pyqtSlot(str)
+    def finished(self, name):
+        """A request of the round is done (stored or failed); schedule the refresh"""
+
+        self.pending.discard(name)
+        self.fetched()
+        delay = self.delay()
+        if self.timer.isActive() and self.timer.remainingTime() <= delay:
+            return
+        logger.debug("Table refresh in {} ms, {} requests pending", delay, len(self.pending))
+        self.timer.start(delay)
+
+    def delay(self):
+        """Milliseconds until the next refresh is due"""
+
+        now = self.clock()
+        wait = 0
+        if self.pending:
+            wait = self.deadline - (now - self.completed_at) * 1000
+        if self.refreshed_at is not None:
+            wait = max(wait, self.min_interval - (now - self.refreshed_at) * 1000)
+        return max(int(wait), 0)
+
+    @pyqtSlot()
+    def fire(self):
+        self.rendering_since = self.completed_at
+        self.completed_at = None
+        self.refreshed_at = self.clock()
+        self.refresh.emit()
+
+    @pyqtSlot()
+    def rendered(self):
+        """Log the latency between fetch completion and the populated table"""
+
+        if self.rendering_since is not None:
+            logger.info("Table rendered {:.0f} ms after fetch completion", (self.clock() - self.rendering_since) * 1000)
+            self.rendering_since = None
 
 
 class ApiManager(QNetworkAccessManager):
-    apis = {
-        'pota': QUrl("https://api.pota.app/v1/spots"),
-        'sota': QUrl("https://api-db2.sota.org.uk/api/spots/-2/all/all"),
-        'dxsummit': QUrl("http://www.dxsummit.fi/api/v1/spots"),
-        'dxheat': QUrl(
-            "https://dxheat.com/source/spots/?a=65&b=15&b=40&m=CW&m=PHONE&m=DIGI&valid=1&spam=1"
-        )
-    }
+    apis = {name: QUrl(url) for name, url in API_URLS.items()}
     store_spots = pyqtSignal(tuple)
+    feed_spots = pyqtSignal(tuple)
+    finish_spots = pyqtSignal(str)
+    discard_spots = pyqtSignal(str)
     filter_spots = pyqtSignal(dict)
 
     def __init__(self, table_updater, spot_handler, poll_time):
@@ -79,22 +258,33 @@ class ApiManager(QNetworkAccessManager):
         self.manager.finished.connect(self.handle_response)
 
         self.active_requests = {}
+        self.recorded = {}
 
         self.store_spots.connect(self.spot_handler.store_spots)
-        self.spot_handler.store_finished.connect(self.trigger_table_update)
+        self.feed_spots.connect(self.spot_handler.feed_spots)
+        self.finish_spots.connect(self.spot_handler.finish_spots)
+        self.discard_spots.connect(self.spot_handler.discard_spots)
+        self.scheduler = RefreshScheduler()
+        self.scheduler.refresh.connect(lambda: self.filter_spots.emit(self.spot_handler.spots.snapshot()))
+        self.spot_handler.store_finished.connect(self.scheduler.finished)
+        self.table_updater.finished.connect(self.scheduler.rendered)
+
+        self.recorder = Recorder(RECORD_PATH) if RECORD_PATH else None
 
         self.timer = QTimer()
         self.timer.timeout.connect(self.fetch_all)
-        self.timer.start(poll_time)
 
-        self.filter_spots.connect(self.table_updater.run)
+        self.evict_timer = QTimer()
+        self.evict_timer.timeout.connect(self.spot_handler.evict_spots)
+        self.evict_timer.start(EVICT_PERIOD)
 
-        self.table_timer = QTimer(self)
-        self.table_timer.timeout.connect(lambda: self.filter_spots.emit(self.spot_handler.spots))
-        self.table_timer.setInterval(10_000)
-        self.table_timer.setSingleShot(True)
+        self.filter_spots.connect(self.table_updater.run)
 
-        self.fetch_all()
+        if REPLAY_PATH:
+            self.start_replay(REPLAY_PATH, REPLAY_SPEED)
+        else:
+            self.timer.start(poll_time)
+            self.fetch_all()
 
     def fetch_all(self):
         """Start asynchronous fetch from each defined API and mark as work-in-progress"""
@@ -106,31 +296,52 @@ class ApiManager(QNetworkAccessManager):
             logger.debug("Fetching from {}", url.toString())
             request = QNetworkRequest(url)
             reply = self.manager.get(request)
+            reply.readyRead.connect(partial(self.handle_chunk, reply))
             self.active_requests[reply] = name
+        self.scheduler.start_round(self.active_requests.values())
+
+    def start_replay(self, path, speed):
+        """Feed recorded responses to the spot handler from a background thread instead of polling"""
+
+        logger.info("Replaying {} at {}x speed", path, speed)
+        self.replay_thread = threading.Thread(
+            target=replay, args=(path, self.store_spots.emit, speed), daemon=True
+        )
+        self.replay_thread.start()
+
+    def handle_chunk(self, reply):
+        """Pass the part of the response received so far to the spot handler, without waiting for the rest"""
+
+        name = self.active_requests.get(reply, "UNKNOWN")
+        status_code = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+        chunk = reply.readAll().data()
+        if status_code != 200 or not chunk:
+            return
+        if self.recorder:
+            self.recorded.setdefault(reply, []).append(chunk)
+        self.feed_spots.emit((name, chunk))
 
     @pyqtSlot("QNetworkReply*")
     def handle_response(self, reply):
         """Once the API replies, check for errors, mark job as done and store collected spots"""
 
+        self.handle_chunk(reply)
         name = self.active_requests.pop(reply, "UNKNOWN")
         logger.debug("{} has finished", name)
+        self.scheduler.fetched()
+        recorded = self.recorded.pop(reply, [])
 
         if reply.error() == QNetworkReply.NetworkError.NoError:
-            data = reply.readAll().data().decode()
-            self.store_spots.emit((name, data))
+            if self.recorder:
+                self.recorder.record(name, b''.join(recorded).decode())
+            self.finish_spots.emit(name)
         else:
             status_code = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
             logger.warning("Error for {}: {}, code = {}", name, reply.errorString(), status_code)
+            self.discard_spots.emit(name)
+            self.scheduler.finished(name)
 
         reply.deleteLater()
-    
-    @pyqtSlot()
-    def trigger_table_update(self):
-        if not self.table_timer.isActive():
-            logger.debug("Starting timer to update table")
-            self.table_timer.start()
-        else:
-            logger.debug("Skipping update, timer is active")
 
 
 class SpotTableUpdater(QObject):
@@ -171,7 +382,8 @@ class SpotTableUpdater(QObject):
                     comment=item.comment,
                     locator=item.locator,
                     distance=f"{item.distance:.0f}" if item.distance else "",
-                    origin=item.origin
+                    origin=item.origin,
+                    key=spot_key(item)
                 )
                 unique.append(spot)
                 idx += 1
@@ -186,11 +398,11 @@ class SpotTableUpdater(QObject):
             bands = PREFERRED_BANDS
         if mode is None:
             mode = PREFERRED_MODES
-        band_map = [SpotHandler.band_ranges[k] for k in bands]
-        logger.debug("Filter parameters: {} {}", band_map, mode)
+        logger.debug("Filter parameters: {} {}", bands, mode)
 
         def band_ok(f):
-            return f and any(f > b[0] and f < b[1] for b in band_map)
+            name = band(f)
+            return name and name in bands
 
         def mode_ok(m):
             return m.upper() in mode
@@ -0,0 +1,61 @@
+"""Scaffolding shared by the tests: one offscreen Qt application, a spot factory and a settable clock"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+from ft_891_hunter.cty import lookup
+
+# read when the application is created, before any test module can create one
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+START = datetime(2025, 8, 4, 10, 0, tzinfo=timezone.utc)
+
+
+class Clock:
+    """Stands in for time.time, starting at START; set now, or move it to a minute after START"""
+
+    def __init__(self):
+        self.now = START.timestamp()
+
+    def __call__(self):
+        return self.now
+
+    def at(self, minute):
+        self.now = (START + timedelta(minutes=minute)).timestamp()
+
+
+def spot(activator='SP9WLG', minute=0, **fields):
+    """
+    Stand-in for a spot model with the attributes the application reads, spotted minute
+    minutes after START; the entity is looked up from the activator unless given
+    """
+
+    values = dict(
+        origin='POTA', activator=activator, frequency=14250.0, mode='SSB', programme='POTA 🏞',
+        reference='', comment='', timestamp=START + timedelta(minutes=minute)
+    )
+    values.update(fields)
+    if 'entity' not in values:
+        values['entity'] = lookup(activator)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The one QApplication of the session; QCoreApplication based tests run in it too"""
+
+    yield QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def make_spot():
+    return spot
+
+
+@pytest.fixture
+def clock():
+    return Clock()
@@ -0,0 +1,58 @@
+import pytest
+
+from ft_891_hunter.activity import ActivityAggregator
+
+
+@pytest.fixture
+def aggregator(clock):
+    return ActivityAggregator(clock=clock)
+
+
+def test_counts_per_dimension(aggregator, make_spot):
+    aggregator.update([
+        make_spot(), make_spot('VK6GC', frequency=7100.0, mode='CW', programme=''), make_spot(frequency=12000.0, mode='')
+    ])
+    assert aggregator.count(15, 'band', '20m') == 1
+    assert aggregator.count(15, 'band', '40m') == 1
+    assert aggregator.count(15, 'mode', 'SSB') == 1
+    assert aggregator.count(15, 'programme', 'POTA 🏞') == 2
+    assert aggregator.count(15, 'continent', 'EU') == 2
+    assert aggregator.count(15, 'continent', 'OC') == 1
+    assert aggregator.summary()[60]['band'] == {'20m': 1, '40m': 1}
+
+
+def test_windows_slide_with_time(aggregator, clock, make_spot):
+    aggregator.update([make_spot(), make_spot(minute=-20), make_spot(minute=-100)])
+    assert [aggregator.count(window, 'band', '20m') for window in (15, 60, 180)] == [1, 2, 3]
+
+    clock.at(15)
+    assert [aggregator.count(window, 'band', '20m') for window in (15, 60, 180)] == [0, 2, 3]
+    clock.at(80)
+    assert [aggregator.count(window, 'band', '20m') for window in (15, 60, 180)] == [0, 0, 2]
+    clock.at(1000)
+    assert [aggregator.count(window, 'band', '20m') for window in (15, 60, 180)] == [0, 0, 0]
+    assert not aggregator.buckets
+
+
+def test_removed_spots_are_subtracted(aggregator, clock, make_spot):
+    old, new = make_spot(minute=-30), make_spot(minute=-5)
+    aggregator.update([old, new])
+    clock.at(10)
+    aggregator.update(removed=[old, new])
+    assert [aggregator.count(window, 'band', '20m') for window in (15, 60, 180)] == [0, 0, 0]
+    assert aggregator.summary()[180]['band'] == {}
+
+    aggregator.update([make_spot(minute=-500)])
+    assert aggregator.count(180, 'band', '20m') == 0
+
+
+def test_update_reports_changes(aggregator, clock, make_spot):
+    spot = make_spot(minute=-10)
+    assert aggregator.update([spot])
+    assert not aggregator.update()
+    clock.at(1)
+    assert not aggregator.update()
+    clock.at(6)
+    assert aggregator.update()
+    assert not aggregator.update(removed=[make_spot(minute=-500)])
+    assert aggregator.update(removed=[spot])
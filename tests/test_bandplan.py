@@ -0,0 +1,51 @@
+import pytest
+
+from types import SimpleNamespace
+
+from ft_891_hunter.bandplan import BAND_PLAN, band, band_plan_mode, infer_mode
+from ft_891_hunter.worker import SpotTableUpdater
+
+
+def test_band_plan_is_sorted_without_overlaps():
+    for (start, end, _), (next_start, _, _) in zip(BAND_PLAN, BAND_PLAN[1:]):
+        assert start < end <= next_start
+
+
+@pytest.mark.parametrize("frequency, mode", [
+    (14025, 'CW'),
+    (14074, 'FT8'),
+    (14075.6, 'FT8'),
+    (14285, 'SSB'),
+    (7110, 'SSB'),
+    (7000, 'CW'),
+    (7040, ''),
+    (145500, 'FM'),
+    (12000, ''),
+    (1000, ''),
+    (500000, ''),
+    (None, ''),
+])
+def test_band_plan_mode(frequency, mode):
+    assert band_plan_mode(frequency) == mode
+
+
+def test_comment_keyword_wins_over_band_plan():
+    assert infer_mode(14025, "up 2 USB") == 'SSB'
+    assert infer_mode(14285, "cw qrs pse") == 'CW'
+    assert infer_mode(14080, "FT4 calling") == 'FT4'
+    assert infer_mode(14285, "CWOPS member") == 'SSB'
+    assert infer_mode(14285, None) == 'SSB'
+
+
+@pytest.mark.parametrize("frequency, name", [
+    (7000.0, '40m'),
+    (7200.0, '40m'),
+    (6999.9, ''),
+    (7200.1, ''),
+    (5355, '60m'),
+])
+def test_filter_agrees_with_band_names(frequency, name):
+    spot = SimpleNamespace(frequency=frequency, mode='CW')
+    assert band(frequency) == name
+    passed = list(SpotTableUpdater.filter_spots([spot], bands={'40m', '60m'}, mode={'CW'}))
+    assert passed == ([spot] if name else [])
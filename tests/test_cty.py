@@ -0,0 +1,75 @@
+import pytest
+
+from ft_891_hunter.cty import PrefixTrie, base_call, home_part, lookup
+
+COUNTRY_FILE = """
+Poland:                   15:  28:  EU:    52.28:    -18.67:   -1.0:  SP:
+    3Z,HF,SN,SO,SP,SQ,SR;
+United States:             5:   8:  NA:    37.53:     91.67:    5.0:  K:
+    AA,K,N,W,W6(3)[6],=W1AW/7<40.0/110.0>;
+Hawaii:                   31:  61:  OC:    21.12:    157.48:   10.0:  KH6:
+    KH6,KH7;
+"""
+
+
+@pytest.fixture(scope="module")
+def trie():
+    return PrefixTrie.from_text(COUNTRY_FILE)
+
+
+def test_longest_prefix_wins(trie):
+    assert trie.lookup('SP9WLG').name == 'Poland'
+    assert trie.lookup('K2PO').name == 'United States'
+    assert trie.lookup('KH6AB').name == 'Hawaii'
+    assert trie.lookup('XX1XX') is None
+
+
+def test_header_fields(trie):
+    entity = trie.lookup('sq9abc')
+    assert (entity.cq_zone, entity.itu_zone, entity.continent) == (15, 28, 'EU')
+    assert entity.latitude == pytest.approx(52.28)
+    assert entity.longitude == pytest.approx(18.67)
+    assert entity.utc_offset == pytest.approx(1.0)
+    assert entity.prefix == 'SP'
+
+
+def test_overrides(trie):
+    entity = trie.lookup('W6XYZ')
+    assert (entity.cq_zone, entity.itu_zone) == (3, 6)
+    exact = trie.lookup('W1AW/7')
+    assert (exact.latitude, exact.longitude) == (40.0, -110.0)
+    assert exact.cq_zone == 5
+
+
+def test_compound_callsigns():
+    assert home_part('OE/PA3EFR/P') == 'OE'
+    assert home_part('SM/OZ1RD') == 'SM'
+    assert home_part('DL1RTW/P') == 'DL1RTW'
+    assert home_part('K2PO/7') == 'K2PO'
+    assert base_call('OE/PA3EFR/P') == 'PA3EFR'
+    assert base_call('SM/OZ1RD') == 'OZ1RD'
+    assert base_call('K2PO/7') == 'K2PO'
+    assert base_call('SP9WLG') == 'SP9WLG'
+
+
+def test_bundled_country_file():
+    assert lookup('SP9WLG/P').name == 'Poland'
+    assert lookup('OE/PA3EFR/P').name == 'Austria'
+    assert lookup('VK6GC').cq_zone == 29
+    assert lookup('UA9ABC').continent == 'AS'
+    assert lookup('M1AOB/P').name == 'England'
+    assert lookup('GM4ABC').name == 'Scotland'
+    assert lookup('RA3ABC').name == 'European Russia'
+    assert lookup('UA3ABC').name == 'European Russia'
+    assert lookup('UK8AR').name == 'Uzbekistan'
+    assert lookup('UJ8JJ').name == 'Uzbekistan'
+    assert lookup('UM8DX').name == 'Uzbekistan'
+    assert lookup('EY8MM').name == 'Tajikistan'
+    assert lookup('EZ8CQ').name == 'Turkmenistan'
+    assert lookup('EX8AB').name == 'Kyrgyzstan'
+    assert lookup('EK6RL').name == 'Armenia'
+    assert lookup('4J9WMT').name == 'Azerbaijan'
+    assert lookup('4K6FO').name == 'Azerbaijan'
+    assert lookup('4L1UN').name == 'Georgia'
+    assert lookup('UN7LZ').name == 'Kazakhstan'
+    assert lookup('UN7LZ').continent == 'AS'
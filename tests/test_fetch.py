@@ -0,0 +1,113 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from ft_891_hunter.fetch import AsyncFetcher, make_session
+from ft_891_hunter.worker import SpotHandler
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serve the recorded API responses and generated SOTA regions over keep-alive HTTP/1.1"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(0.02)
+        body, status = self.route()
+        with server.lock:
+            server.in_flight -= 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def route(self):
+        parts = self.path.strip("/").split("/")
+        if parts[0] == "regions":
+            country, region = parts[1:3]
+            summits = [
+                {"summitCode": f"{country}/{region}-{idx:03d}", "locator": "JN25ab", "latitude": 45.0, "longitude": 4.0}
+                for idx in range(1, 51)
+            ]
+            return json.dumps({"summits": summits}).encode(), 200
+        try:
+            with open(f"tests/{parts[0]}_response.json", "rb") as response:
+                return response.read(), 200
+        except FileNotFoundError:
+            return b"{}", 404
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    httpd.lock = threading.Lock()
+    httpd.connections = set()
+    httpd.in_flight = 0
+    httpd.max_in_flight = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def base_url(server):
+    host, port = server.server_address
+    return f"http://{host}:{port}"
+
+
+def test_fetch_all_stores_every_source(server, tmp_path):
+    url = base_url(server)
+    handler = SpotHandler()
+    session = make_session(per_host=2)
+    apis = {name: f"{url}/{name}" for name in ('pota', 'sota', 'dxsummit', 'dxheat')}
+    fetcher = AsyncFetcher(handler.store_spots, apis=apis, session=session, per_host=2)
+    with (
+        patch("ft_891_hunter.models.http_session", session),
+        patch("ft_891_hunter.models.SOTA_REGION_URL", url + "/regions/{}/{}"),
+        patch("ft_891_hunter.models.SHELVE_PATH", str(tmp_path / "sota.db")),
+    ):
+        asyncio.run(fetcher.fetch_all())
+
+    assert len(handler.spots['pota']) == 3
+    assert len(handler.spots['sota']) == 3
+    assert len(handler.spots['dxsummit']) == 6
+    assert len(handler.spots['dxheat']) == 7
+    assert handler.spots['sota'][0].locator == 'JN25ab'
+    assert not fetcher.active_requests
+    # Spot APIs and SOTA region lookups share the same bounded keep-alive pool
+    assert server.max_in_flight <= 2
+    assert len(server.connections) <= 2
+
+
+def test_failed_source_is_skipped(server):
+    url = base_url(server)
+    stored = []
+    fetcher = AsyncFetcher(stored.append, apis={'pota': f"{url}/pota", 'missing': f"{url}/missing"})
+    asyncio.run(fetcher.fetch_all())
+
+    assert [name for name, _ in stored] == ['pota']
+    assert not fetcher.active_requests
+
+
+def test_pending_source_is_not_fetched_twice(server):
+    stored = []
+    fetcher = AsyncFetcher(stored.append, apis={'pota': f"{base_url(server)}/pota"})
+    fetcher.active_requests.add('pota')
+    asyncio.run(fetcher.fetch_all())
+
+    assert not stored
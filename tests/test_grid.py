@@ -0,0 +1,54 @@
+import haversine
+import maidenhead
+import pytest
+
+from ft_891_hunter.grid import SQUARES, GridTable, distance_bearing, lookup, square_centre, square_index
+
+ORIGIN = (52.2, 21.0)
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    return GridTable.load(tmp_path_factory.mktemp("grid") / "grid.bin", ORIGIN)
+
+
+def test_square_index_covers_all_squares():
+    assert square_index('AA00') == 0
+    assert square_index('RR99') == SQUARES - 1
+    assert square_centre(square_index('JN67')) == maidenhead.to_location('JN67', center=True)
+    for locator in ('SA00', 'AAB0', 'AA', 'JN6X'):
+        with pytest.raises(ValueError):
+            square_index(locator)
+
+
+def test_table_entries(table):
+    square = table.square('jo51')
+    centre = maidenhead.to_location('JO51', center=True)
+    assert (square.latitude, square.longitude) == centre
+    assert square.distance == pytest.approx(haversine.haversine(ORIGIN, centre))
+    assert square.bearing == pytest.approx(distance_bearing(ORIGIN, centre)[1])
+
+
+def test_bearing():
+    assert distance_bearing((0, 0), (10, 0))[1] == pytest.approx(0)
+    assert distance_bearing((0, 0), (0, 10))[1] == pytest.approx(90)
+    assert distance_bearing((0, 0), (0, -10))[1] == pytest.approx(270)
+
+
+def test_table_is_cached_on_disk(tmp_path, table):
+    path = tmp_path / "grid.bin"
+    table.save(path)
+    cached = GridTable.load(path, ORIGIN)
+    assert cached.values == table.values
+
+    moved = GridTable.load(path, (0.0, 0.0))
+    assert moved.square('JO51') != table.square('JO51')
+    assert GridTable.load(path, (0.0, 0.0)).values == moved.values
+
+
+def test_lookup_of_subsquare():
+    square = lookup('JN67ph')
+    assert (square.latitude, square.longitude) == maidenhead.to_location('JN67PH', center=True)
+    assert lookup('JN67PH12') == square
+    with pytest.raises(ValueError):
+        lookup('JN67PZ')
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from ft_891_hunter.jsonstream import JsonArrayParser
+
+
+def parse_in_chunks(data, size):
+    parser = JsonArrayParser()
+    items = []
+    for idx in range(0, len(data), size):
+        items.extend(parser.feed(data[idx:idx + size]))
+    parser.close()
+    return items
+
+
+@pytest.mark.parametrize("name", ['pota', 'sota', 'dxsummit', 'dxheat'])
+@pytest.mark.parametrize("size", [1, 7, 100, 1_000_000])
+def test_fixtures_in_chunks(name, size):
+    with open(f'tests/{name}_response.json', 'rb') as response:
+        data = response.read()
+    assert parse_in_chunks(data, size) == json.loads(data)
+
+
+def test_elements_are_returned_as_soon_as_complete():
+    parser = JsonArrayParser()
+    assert parser.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+    assert parser.feed(b': [1, {"c": 2}]}') == [{"b": [1, {"c": 2}]}]
+    assert parser.feed(b']') == []
+    parser.close()
+
+
+def test_strings_with_brackets_escapes_and_unicode():
+    data = '[{"s": "]}\\"{[\\\\", "t": "☘ 🏞"}, {"u": "\\u00e9"}]'.encode()
+    assert parse_in_chunks(data, 1) == json.loads(data)
+
+
+def test_empty_array():
+    assert parse_in_chunks(b' [ ] ', 2) == []
+
+
+@pytest.mark.parametrize("data", [b'{"a": 1}', b']', b'[{"a": 1}] [{"b": 2}]', b'[[1, 2]]', b'[{"a": 1}, 3]'])
+def test_invalid_documents(data):
+    with pytest.raises(ValueError):
+        parse_in_chunks(data, 3)
+
+
+def test_incomplete_array():
+    parser = JsonArrayParser()
+    parser.feed(b'[{"a": 1}, {"b": 2')
+    with pytest.raises(ValueError):
+        parser.close()
@@ -0,0 +1,117 @@
+import shelve
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ft_891_hunter import models
+from ft_891_hunter.prewarm import SOTA_ASSOCIATION_URL, SOTA_ASSOCIATIONS_URL, SummitPrewarmer, distance_to_area
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.status_code = 200 if data is not None else 404
+        self.data = data
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise RuntimeError(self.status_code)
+
+
+class FakeSession:
+    def __init__(self, routes):
+        self.routes = routes
+        self.requests = []
+
+    def get(self, url, timeout=None):
+        self.requests.append(url)
+        return FakeResponse(self.routes.get(url))
+
+
+def bounds(lat, lon, size=1.0):
+    return {'minLat': lat, 'maxLat': lat + size, 'minLong': lon, 'maxLong': lon + size}
+
+
+def region_summits(country, region):
+    return {'summits': [
+        {'summitCode': f"{country}/{region}-001", 'locator': 'JO90aa', 'latitude': 50.5, 'longitude': 18.5}
+    ]}
+
+
+ROUTES = {
+    SOTA_ASSOCIATIONS_URL: [
+        {'associationCode': 'SP', **bounds(49, 14, 6)},
+        {'associationCode': 'VK3', **bounds(-39, 141, 5)},
+        {'associationCode': 'XX'},
+    ],
+    SOTA_ASSOCIATION_URL.format('SP'): {'regions': [
+        {'regionCode': 'BZ', **bounds(49.3, 18.8)},
+        {'regionCode': 'SK', **bounds(50.5, 17)},
+        {'regionCode': 'FAR', **bounds(54, 14)},
+    ]},
+    models.SOTA_REGION_URL.format('SP', 'BZ'): region_summits('SP', 'BZ'),
+    models.SOTA_REGION_URL.format('SP', 'SK'): region_summits('SP', 'SK'),
+    models.SOTA_REGION_URL.format('F', 'CR'): region_summits('F', 'CR'),
+}
+
+
+@pytest.fixture(autouse=True)
+def summit_cache(tmp_path):
+    path = str(tmp_path / "sota.db")
+    with (
+        patch("ft_891_hunter.models.SHELVE_PATH", path),
+        patch.dict("ft_891_hunter.models.seen_regions", {('F', 'CR'): time.time()}, clear=True),
+    ):
+        yield path
+
+
+def make_prewarmer(session, sleeps):
+    return SummitPrewarmer(origin=(50.0, 19.0), radius=150, max_age=3600, interval=2,
+                           session=session, sleep=sleeps.append)
+
+
+def test_distance_to_area():
+    assert distance_to_area((50.0, 19.0), bounds(49, 18, 2)) == 0
+    assert distance_to_area((50.0, 19.0), {'minLat': 1}) is None
+    assert distance_to_area((50.0, 19.0), bounds(51, 19)) == pytest.approx(111, abs=1)
+
+
+def test_prewarm_seen_and_nearby_regions(summit_cache):
+    session = FakeSession(ROUTES)
+    sleeps = []
+    make_prewarmer(session, sleeps).run()
+
+    assert session.requests == [
+        SOTA_ASSOCIATIONS_URL,
+        SOTA_ASSOCIATION_URL.format('SP'),
+        models.SOTA_REGION_URL.format('F', 'CR'),
+        models.SOTA_REGION_URL.format('SP', 'BZ'),
+        models.SOTA_REGION_URL.format('SP', 'SK'),
+    ]
+    assert len(sleeps) == 4
+    assert all(0 < wait <= 2 for wait in sleeps)
+    with shelve.open(summit_cache) as db:
+        assert db['SP/BZ-001'] == ('JO90aa', 50.5, 18.5)
+        assert 'region:F/CR' in db
+
+
+def test_fresh_regions_are_not_fetched_again(summit_cache):
+    make_prewarmer(FakeSession(ROUTES), []).run()
+    models.seen_regions.clear()
+
+    session = FakeSession(ROUTES)
+    make_prewarmer(session, []).run()
+    assert not session.requests
+
+
+def test_stale_regions_are_refreshed(summit_cache):
+    make_prewarmer(FakeSession(ROUTES), []).run()
+    with shelve.open(summit_cache) as db:
+        db['region:SP/SK'] = time.time() - 7200
+
+    session = FakeSession(ROUTES)
+    make_prewarmer(session, []).run()
+    assert session.requests == [models.SOTA_REGION_URL.format('SP', 'SK')]
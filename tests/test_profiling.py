@@ -0,0 +1,130 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+
+import pytest
+from PyQt6.QtCore import QCoreApplication, QObject, QThread, pyqtSignal, pyqtSlot
+
+from ft_891_hunter.profiling import Profile, ThreadProfile, ThreadProfiler
+
+pytestmark = pytest.mark.usefixtures("app")
+
+
+def busy_worker_function():
+    return sum(range(10_000))
+
+
+class Worker(QObject):
+    done = pyqtSignal()
+
+    @pyqtSlot()
+    def work(self):
+        busy_worker_function()
+        self.done.emit()
+
+
+def busy_gui_function():
+    return sum(range(10_000))
+
+
+def profiled_functions(path):
+    return {func[2] for func in pstats.Stats(str(path)).stats}
+
+
+def run_worker(thread, worker):
+    """Let the worker run once in its thread and wait for it in the event loop"""
+
+    finished = []
+    worker.done.connect(lambda: finished.append(True))
+    worker.moveToThread(thread)
+    thread.start()
+    QCoreApplication.processEvents()
+    QThread.currentThread().msleep(10)
+    worker.metaObject().invokeMethod(worker, "work")
+    for _ in range(100):
+        QCoreApplication.processEvents()
+        if finished:
+            break
+        QThread.currentThread().msleep(10)
+    assert finished
+
+
+# cProfile runs on sys.monitoring from Python 3.12 and cannot keep one profile per thread there
+PROFILE_CLASSES = [ThreadProfile] if sys.version_info >= (3, 12) else [cProfile.Profile, ThreadProfile]
+
+
+def test_profile_class_depends_on_python_version():
+    assert Profile is (ThreadProfile if sys.version_info >= (3, 12) else cProfile.Profile)
+
+
+@pytest.mark.parametrize("profile_class", PROFILE_CLASSES)
+def test_each_thread_has_its_own_profile(tmp_path, profile_class):
+    profiler = ThreadProfiler(str(tmp_path), enabled=True, profile_class=profile_class)
+    thread = profiler.thread("Worker")
+    worker = Worker()
+    profiler.start_here("GUI")
+    run_worker(thread, worker)
+    busy_gui_function()
+
+    profiler.finish()
+    thread.quit()
+    thread.wait()
+
+    files = {name.rsplit('-', 1)[1]: tmp_path / name for name in os.listdir(tmp_path)}
+    assert set(files) == {"Worker.pstats", "GUI.pstats"}
+    assert "busy_worker_function" in profiled_functions(files["Worker.pstats"])
+    assert "busy_worker_function" not in profiled_functions(files["GUI.pstats"])
+    assert "busy_gui_function" in profiled_functions(files["GUI.pstats"])
+    assert not any(starter.active for starter in profiler.starters)
+
+
+def test_dump_after_refresh_cycles(tmp_path):
+    profiler = ThreadProfiler(str(tmp_path), cycles=2, enabled=True)
+    profiler.start_here("GUI")
+    profiler.cycle_finished()
+    assert not os.listdir(tmp_path)
+    profiler.cycle_finished()
+    assert len(os.listdir(tmp_path)) == 1
+    profiler.cycle_finished()
+    profiler.finish()
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_disabled_profiler_does_nothing(tmp_path):
+    profiler = ThreadProfiler(str(tmp_path), enabled=False)
+    assert type(profiler.thread("Worker")) is QThread
+    profiler.start_here("GUI")
+    profiler.finish()
+    assert not profiler.starters
+    assert not os.listdir(tmp_path)
+
+
+def countdown(n):
+    return countdown(n - 1) + len('x') if n else 0
+
+
+def test_thread_profile_counts_calls_and_callers(tmp_path):
+    profile = ThreadProfile()
+
+    def run():
+        profile.enable()
+        countdown(3)
+        busy_worker_function()
+        profile.disable()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    busy_gui_function()
+    profile.dump_stats(tmp_path / "thread.pstats")
+
+    stats = {key[2]: value for key, value in pstats.Stats(str(tmp_path / "thread.pstats")).stats.items()}
+    assert 'busy_gui_function' not in stats
+    cc, nc, tt, ct, callers = stats['countdown']
+    assert (cc, nc) == (1, 4)
+    assert 0 <= tt <= ct
+    assert {caller[2] for caller in callers} == {'countdown'}
+    assert stats['busy_worker_function'][:2] == (1, 1)
+    assert stats["<built-in method len>"][1] == 3
@@ -0,0 +1,54 @@
+import pytest
+
+from ft_891_hunter.worker import RefreshScheduler
+
+
+@pytest.fixture
+def scheduler(app, clock):
+    return RefreshScheduler(deadline=2000, min_interval=1000, clock=clock)
+
+
+def test_refresh_right_after_last_request(scheduler, clock):
+    scheduler.start_round(['pota', 'sota'])
+    scheduler.finished('pota')
+    assert scheduler.timer.isActive()
+    assert scheduler.timer.remainingTime() > 1000
+
+    clock.now += 0.3
+    scheduler.finished('sota')
+    assert scheduler.timer.remainingTime() == 0
+
+
+def test_deadline_counts_from_first_completion(scheduler, clock):
+    scheduler.start_round(['pota', 'sota'])
+    scheduler.finished('pota')
+    clock.now += 1.5
+    assert scheduler.delay() == 500
+    clock.now += 1
+    assert scheduler.delay() == 0
+
+
+def test_minimum_interval_between_refreshes(scheduler, clock):
+    refreshes = []
+    scheduler.refresh.connect(lambda: refreshes.append(clock.now))
+    started = clock.now
+    scheduler.finished('pota')
+    scheduler.fire()
+    assert refreshes == [started]
+
+    clock.now += 0.25
+    scheduler.finished('sota')
+    assert scheduler.delay() == 750
+    assert scheduler.timer.isActive()
+
+
+def test_latency_is_tracked_until_rendered(scheduler, clock):
+    started = clock.now
+    scheduler.fetched()
+    clock.now += 0.1
+    scheduler.finished('pota')
+    scheduler.fire()
+    assert scheduler.rendering_since == started
+    assert scheduler.completed_at is None
+    scheduler.rendered()
+    assert scheduler.rendering_since is None
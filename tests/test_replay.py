@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+
+from ft_891_hunter.replay import Recorder, read_archive, replay
+from ft_891_hunter.store import SpotStore
+from ft_891_hunter.worker import SpotHandler
+
+
+def read_fixture(name):
+    with open(f'tests/{name}_response.json', encoding='utf-8') as response:
+        return response.read()
+
+
+def test_records_are_appended(tmp_path):
+    path = tmp_path / "spots.gz"
+    Recorder(path).record('pota', '[]', timestamp=100.0)
+    Recorder(path).record('dxheat', '[1]', timestamp=102.5)
+
+    assert list(read_archive(path)) == [(100.0, 'pota', '[]'), (102.5, 'dxheat', '[1]')]
+
+
+def test_replay_is_scaled_in_time(tmp_path):
+    path = tmp_path / "spots.gz"
+    recorder = Recorder(path)
+    for timestamp, name in ((10.0, 'a'), (14.0, 'b'), (20.0, 'c')):
+        recorder.record(name, '[]', timestamp=timestamp)
+    delays = []
+    stored = []
+
+    assert replay(path, stored.append, speed=2, sleep=delays.append) == 3
+    assert delays == [2.0, 3.0]
+    assert [name for name, _, _ in stored] == ['a', 'b', 'c']
+    assert [timestamp for _, _, timestamp in stored] == [10.0, 14.0, 20.0]
+
+    delays.clear()
+    replay(path, stored.append, speed=0, sleep=delays.append)
+    assert not delays
+
+
+def test_replay_into_spot_handler(tmp_path):
+    path = tmp_path / "spots.gz"
+    recorder = Recorder(path)
+    recorder.record('pota', read_fixture('pota'), timestamp=1.0)
+    recorder.record('dxsummit', read_fixture('dxsummit'), timestamp=2.0)
+    handler = SpotHandler()
+
+    replay(path, handler.store_spots, speed=0)
+
+    assert len(handler.spots['pota']) == 3
+    assert len(handler.spots['dxsummit']) == 6
+
+
+def test_spot_age_follows_recording_time(tmp_path):
+    path = tmp_path / "spots.gz"
+    recorded_at = datetime(2025, 8, 4, 8, 50, tzinfo=timezone.utc).timestamp()
+    Recorder(path).record('dxsummit', read_fixture('dxsummit'), timestamp=recorded_at)
+    handler = SpotHandler()
+    handler.spots = SpotStore(max_age=10 * 60, clock=handler.now)
+
+    replay(path, handler.store_spots, speed=0)
+
+    assert sorted(spot.activator for spot in handler.spots['dxsummit']) == ['DL1RTW/P', 'F4GYM/P', 'SP9WLG/P', 'VK6GC']
+    assert handler.now() == recorded_at
+    handler.evict_spots()
+    assert len(handler.spots['dxsummit']) == 4
+
+
+def test_activity_follows_recording_time(tmp_path):
+    path = tmp_path / "spots.gz"
+    recorded_at = datetime(2025, 8, 4, 8, 50, tzinfo=timezone.utc).timestamp()
+    Recorder(path).record('dxsummit', read_fixture('dxsummit'), timestamp=recorded_at)
+    handler = SpotHandler()
+    summaries = []
+    handler.activity_changed.connect(summaries.append)
+
+    replay(path, handler.store_spots, speed=0)
+
+    assert len(summaries) == 1
+    assert handler.activity.count(180, 'band', '20m') == 4
+    assert handler.activity.count(180, 'band', '40m') == 2
+    assert handler.activity.count(15, 'band', '20m') == 3
+
+
+def test_truncated_archive(tmp_path):
+    path = tmp_path / "spots.gz"
+    recorder = Recorder(path)
+    recorder.record('pota', '[]', timestamp=1.0)
+    complete = path.stat().st_size
+    recorder.record('sota', '[]', timestamp=2.0)
+    path.write_bytes(path.read_bytes()[:complete + 15])
+
+    assert [name for _, name, _ in read_archive(path)] == ['pota']
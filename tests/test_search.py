@@ -0,0 +1,121 @@
+import random
+
+import pytest
+from PyQt6.QtWidgets import QStackedLayout
+
+from ft_891_hunter.dialogs import SpotTable
+from ft_891_hunter.search import SearchIndex
+from ft_891_hunter.store import spot_key
+from ft_891_hunter.worker import SpotData
+
+
+@pytest.fixture
+def spots(make_spot):
+    return [
+        make_spot('SP9WLG/P', reference='SP-0123', comment='CQ POTA 2-fer'),
+        make_spot('OE/SP9ABC/P', reference='OE/ST-412', comment='QRT soon', origin='SOTA'),
+        make_spot('SM5YRA/P', reference='SE-0375', comment='THANK YOU 73+ QRV 2-fer: SE-0375 SE-0376'),
+        make_spot('VK6GC', comment='IOTA OC-001', origin='DXSummit'),
+    ]
+
+
+def activators(index, text):
+    found = index.search(text)
+    return None if found is None else sorted(index.keys[ident][1] for ident in found)
+
+
+@pytest.fixture
+def index(spots):
+    index = SearchIndex()
+    index.update(spots)
+    return index
+
+
+def test_prefix_search(index):
+    assert activators(index, '') is None
+    assert activators(index, 'sp9') == ['OE/SP9ABC/P', 'SP9WLG/P']
+    assert activators(index, 'OE/') == ['OE/SP9ABC/P']
+    assert activators(index, 'se-03') == ['SM5YRA/P']
+    assert activators(index, 'iot') == ['VK6GC']
+    assert activators(index, '2-FER') == ['SM5YRA/P', 'SP9WLG/P']
+    assert activators(index, '2-fer sp') == ['SP9WLG/P']
+    assert activators(index, 'XX') == []
+
+
+def test_incremental_updates(index, spots, make_spot):
+    index.update([make_spot('SP9XYZ', comment='CQ IOTA')], [spots[0], spots[3]])
+    assert len(index) == 3
+    assert activators(index, 'sp9') == ['OE/SP9ABC/P', 'SP9XYZ']
+    assert activators(index, 'iota') == ['SP9XYZ']
+    assert activators(index, 'OC-001') == []
+    assert 'OC-001' not in index.token_list
+    index.update(removed=spots)
+    index.update(removed=[make_spot('SP9XYZ', comment='CQ IOTA')])
+    assert not index.terms and not index.tokens and not index.token_list
+
+
+def many_spots(make_spot, count=10_000):
+    rng = random.Random(39)
+    calls = [f"{rng.choice(['SP', 'DL', 'G', 'K', 'VK'])}{rng.randint(0, 9)}{idx}" for idx in range(count)]
+    return [
+        make_spot(call, idx, reference=f"XX-{idx:04d}", comment=f"CQ POTA {idx}")
+        for idx, call in enumerate(calls)
+    ]
+
+
+def test_search_with_many_spots(make_spot):
+    spots = many_spots(make_spot)
+    index = SearchIndex()
+    index.update(spots)
+    for text in ('S', 'SP', 'SP5', 'SP51', 'SP512'):
+        assert activators(index, text) == sorted(spot.activator for spot in spots if spot.activator.startswith(text))
+
+
+def row_data(idx, spot):
+    return SpotData(
+        idx=idx, timestamp='now', frequency=str(spot.frequency), mode='SSB', programme='',
+        reference=spot.reference, activator=spot.activator, comment=spot.comment, locator='',
+        distance='', origin=spot.origin, key=spot_key(spot)
+    )
+
+
+def test_table_rows_follow_search(app, spots):
+    table = SpotTable(QStackedLayout())
+    table.index_spots(spots, [])
+    table.populate_table([row_data(idx, spot) for idx, spot in enumerate(spots)])
+
+    table.search('sp9')
+    assert [table.isRowHidden(row) for row in range(4)] == [False, False, True, True]
+
+    table.index_spots([], [spots[0]])
+    table.remove_spots([], [spots[0]])
+    assert [table.isRowHidden(row) for row in range(3)] == [False, True, True]
+
+    table.populate_table([row_data(idx, spot) for idx, spot in enumerate(spots[2:])])
+    assert [table.isRowHidden(row) for row in range(2)] == [True, True]
+
+    table.search('')
+    assert [table.isRowHidden(row) for row in range(2)] == [False, False]
+
+
+def test_typing_toggles_only_changed_rows(app, make_spot, monkeypatch):
+    spots = many_spots(make_spot)
+    table = SpotTable(QStackedLayout())
+    table.index_spots(spots, [])
+    table.populate_table([row_data(idx, spot) for idx, spot in enumerate(spots)])
+    toggled = []
+    monkeypatch.setattr(table, 'setRowHidden', lambda row, hide: toggled.append(row))
+
+    table.search('S')
+    assert len(toggled) == sum(not spot.activator.startswith('S') for spot in spots)
+    previous = {row for row, spot in enumerate(spots) if spot.activator.startswith('S')}
+    for text in ('SP', 'SP5', 'SP51'):
+        toggled.clear()
+        table.search(text)
+        shown = {row for row, spot in enumerate(spots) if spot.activator.startswith(text)}
+        assert sorted(toggled) == sorted(previous - shown)
+        previous = shown
+
+    toggled.clear()
+    table.search('')
+    assert len(toggled) == len(spots) - len(previous)
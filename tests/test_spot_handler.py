@@ -1,11 +1,12 @@
-from datetime import timezone
+from datetime import datetime, timezone
 from unittest.mock import patch
 
 import pytest
 from pydantic import BaseModel
 
-from ft_891_hunter.worker import SpotHandler
+from ft_891_hunter.worker import SpotHandler, SpotTableUpdater
 from ft_891_hunter.models import get_coordinates_from_summit_code
+from ft_891_hunter.watchlist import Watchlist
 
 
 @pytest.fixture(scope="module", autouse=True)
@@ -74,7 +75,7 @@ def test_simple_fields_dxsummit(dxsummit):
     assert pytest.approx(dxsummit[0].frequency, 1) == 14074
     assert dxsummit[0].activator == 'VK6GC'
     assert dxsummit[0].comment == "IOTA OC-001"
-    assert dxsummit[0].mode == ""
+    assert dxsummit[0].mode == "FT8"
     assert dxsummit[0].origin == 'DXSummit'
     assert pytest.approx(dxsummit[0].latitude, 0.1) == -32.0
     assert pytest.approx(dxsummit[0].longitude, 0.1) == -115.9
@@ -193,3 +194,101 @@ def test_programme_parsing(dxsummit, dxheat):
     assert dxheat[4].programme == 'WWFF ☘'
     assert dxheat[5].programme == 'WWFF ☘'
     assert dxheat[6].programme == 'WWFF ☘'
+
+
+def test_coordinates_from_dxcc_entity():
+    handler = SpotHandler()
+    raw = '[{"Frequency": "14250", "DXCall": "SP9WLG/P", "Time": "10:42", "Date": "04/08/25", "Comment": "POTA"}]'
+    handler.store_spots(('dxheat', raw))
+    spot = handler.spots['dxheat'][0]
+    assert spot.entity.name == 'Poland'
+    assert pytest.approx(spot.latitude, 0.01) == 52.28
+    assert pytest.approx(spot.longitude, 0.01) == 18.67
+    assert spot.distance is not None
+
+
+def test_store_spots_from_chunks():
+    handler = SpotHandler()
+    with open('tests/dxsummit_response.json', 'rb') as response:
+        data = response.read()
+    for idx in range(0, len(data), 100):
+        handler.feed_spots(('dxsummit', data[idx:idx + 100]))
+    assert 'dxsummit' not in handler.spots
+    assert len(handler.streams['dxsummit'][1]) == 6
+    handler.finish_spots('dxsummit')
+    assert len(handler.spots['dxsummit']) == 6
+    assert not handler.streams
+
+
+def test_truncated_chunks_are_not_stored():
+    handler = SpotHandler()
+    with open('tests/pota_response.json', 'rb') as response:
+        handler.feed_spots(('pota', response.read()[:-20]))
+    handler.finish_spots('pota')
+    assert 'pota' not in handler.spots
+
+    handler.feed_spots(('pota', b'<html>'))
+    handler.feed_spots(('pota', b'[]'))
+    handler.finish_spots('pota')
+    assert 'pota' not in handler.spots
+
+    handler.feed_spots(('pota', b'[[1, 2]]'))
+    handler.finish_spots('pota')
+    assert 'pota' not in handler.spots
+
+
+def test_watchlist_is_checked_against_new_spots_only():
+    handler = SpotHandler()
+    handler.watchlist = Watchlist(calls=['SM5YRA/P'], keywords=['RBN'])
+    matched = []
+    handler.watch_matched.connect(matched.append)
+    with open('tests/pota_response.json', encoding='utf-8') as pota_file:
+        data = pota_file.read()
+    handler.store_spots(('pota', data))
+    assert len(matched) == 1
+    assert [spot.activator for spot, _ in matched[0]] == ['SM5YRA/P', 'W4DHW', 'E25RMW']
+    assert matched[0][1][1] == ['RBN']
+
+    handler.store_spots(('pota', data))
+    assert len(matched) == 1
+
+
+def test_mode_inferred_at_ingest(dxsummit):
+    assert [spot.mode for spot in dxsummit] == ['FT8', 'SSB', 'SSB', 'CW', 'SSB', 'SSB']
+    filtered = list(SpotTableUpdater.filter_spots(dxsummit, bands={'20m'}, mode={'SSB'}))
+    assert [spot.frequency for spot in filtered] == [14243, 14285]
+
+
+def test_activity_follows_the_store():
+    handler = SpotHandler()
+    raw = '[{"Frequency": "14250", "DXCall": "SP9WLG/P", "Time": "%s", "Date": "%s", "Comment": "POTA"}]'
+    now = datetime.now(timezone.utc)
+    summaries = []
+    handler.activity_changed.connect(summaries.append)
+    handler.store_spots(('dxheat', raw % (now.strftime("%H:%M"), now.strftime("%d/%m/%y"))))
+    assert handler.activity.count(15, 'band', '20m') == 1
+    assert summaries[-1][15]['continent'] == {'EU': 1}
+
+    handler.store_spots(('dxheat', '[]'))
+    assert handler.activity.count(15, 'band', '20m') == 0
+    assert summaries[-1][15]['band'] == {}
+
+    handler.evict_spots()
+    handler.store_spots(('dxheat', '[]'))
+    assert len(summaries) == 2
+
+
+def test_spot_without_coordinates_reaches_the_table():
+    handler = SpotHandler()
+    raw = '[{"dx_call": "XX9ZZZ", "time": "2025-08-04T08:46:05", "frequency": 7150.0, "info": "CQ"}]'
+    handler.store_spots(('dxsummit', raw))
+    spot = handler.spots['dxsummit'][0]
+    assert spot.entity is None
+    assert spot.latitude is None and spot.locator == ''
+
+    updater = SpotTableUpdater()
+    rows = []
+    updater.finished.connect(rows.append)
+    with patch("ft_891_hunter.worker.PREFERRED_BANDS", {'40m'}), patch("ft_891_hunter.worker.PREFERRED_MODES", {'SSB'}):
+        updater.run(handler.spots.snapshot())
+    assert [(row.activator, row.locator, row.distance) for row in rows[0]] == [('XX9ZZZ', '', '')]
@@ -0,0 +1,56 @@
+from ft_891_hunter.store import SpotStore, spot_key
+
+
+def keys(spots):
+    return sorted(spot_key(spot)[1] for spot in spots)
+
+
+def test_replace_returns_deltas(make_spot):
+    store = SpotStore()
+    added, removed = store.replace('pota', [make_spot('A', 1), make_spot('B', 2)])
+    assert keys(added) == ['A', 'B'] and not removed
+
+    added, removed = store.replace('pota', [make_spot('B', 2), make_spot('C', 3)])
+    assert keys(added) == ['C']
+    assert keys(removed) == ['A']
+    assert keys(store['pota']) == ['B', 'C']
+    assert store.snapshot() == {'pota': store['pota']}
+
+
+def test_eviction_by_age(clock, make_spot):
+    clock.at(30)
+    store = SpotStore(max_age=10 * 60, clock=clock)
+    added, removed = store.replace('pota', [make_spot('A', 5), make_spot('B', 25)])
+    assert keys(added) == ['B'] and not removed
+
+    clock.at(40)
+    assert keys(store.evict()) == ['B']
+    assert store['pota'] == []
+
+
+def test_eviction_by_count_per_source(make_spot):
+    store = SpotStore(max_per_source=2)
+    store.add('dxsummit', [make_spot('A', 1), make_spot('B', 2)])
+    added, removed = store.add('dxsummit', [make_spot('C', 3)])
+    assert keys(added) == ['C']
+    assert keys(removed) == ['A']
+    assert keys(store['dxsummit']) == ['B', 'C']
+
+
+def test_eviction_by_total_count_picks_oldest_overall(make_spot):
+    store = SpotStore(max_total=3)
+    store.replace('pota', [make_spot('A', 1), make_spot('B', 4)])
+    _, removed = store.replace('sota', [make_spot('C', 2, origin='SOTA'), make_spot('D', 3, origin='SOTA')])
+    assert keys(removed) == ['A']
+    _, removed = store.add('sota', [make_spot('E', 5, origin='SOTA')])
+    assert keys(removed) == ['C']
+    assert keys(store['pota']) == ['B']
+    assert keys(store['sota']) == ['D', 'E']
+
+
+def test_add_ignores_known_spots(make_spot):
+    store = SpotStore()
+    store.add('dxheat', [make_spot('A', 1, origin='DXHeat')])
+    added, removed = store.add('dxheat', [make_spot('A', 1, origin='DXHeat')])
+    assert not added and not removed
+    assert len(store['dxheat']) == 1
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+from PyQt6.QtCore import QPointF, Qt
+from PyQt6.QtGui import QMouseEvent
+
+from ft_891_hunter.spotmap import GridIndex, SpotMap, project
+
+
+def test_projection_keeps_distance_and_bearing():
+    assert project(1000, 0) == pytest.approx((0, -1000))
+    assert project(1000, 90) == pytest.approx((1000, 0))
+    assert project(500, 180) == pytest.approx((0, 500))
+
+
+def test_grid_index_query():
+    rng = random.Random(38)
+    index = GridIndex(cell=100)
+    points = {key: (rng.uniform(-1000, 1000), rng.uniform(-1000, 1000)) for key in range(2000)}
+    for key, (x, y) in points.items():
+        index.insert(key, x, y, key)
+    index.remove(0)
+    index.insert(1, 5, 5, 1)
+    found = {value for _, _, value in index.query(-250, -50, 120, 300)}
+    expected = {key for key, (x, y) in points.items() if -250 <= x <= 120 and -50 <= y <= 300} - {0, 1} | {1}
+    assert found == expected
+    assert len(index) == 1999
+    assert {value for _, _, value in index.query(-1e6, -1e6, 1e6, 1e6)} == set(points) - {0}
+
+
+def test_grid_index_cells():
+    index = GridIndex(cell=10)
+    assert index.insert('a', 1, 1, 'a') == (0, 0)
+    assert index.insert('b', 3, 3, 'b') == (0, 0)
+    assert index.insert('c', 15, -1, 'c') == (1, -1)
+    assert index.cell_range(-5, -5, 25, 5) == (range(-1, 3), range(-1, 1))
+    assert {cell: set(points) for cell, points in index.cells_in(-5, -5, 25, 5).items()} == {
+        (0, 0): {'a', 'b'}, (1, -1): {'c'}
+    }
+    assert index.cells_in(-1e6, -1e6, 1e6, 1e6).keys() == {(0, 0), (1, -1)}
+    assert index.remove('c') == (1, -1)
+    assert index.remove('c') is None
+    assert sorted(key for key, _, _, _ in index.points()) == ['a', 'b']
+
+
+@pytest.fixture
+def spot_map(app):
+    view = SpotMap()
+    view.resize(800, 600)
+    view.show()
+    yield view
+    view.close()
+
+
+def test_items_are_bounded_by_clusters(spot_map, make_spot):
+    rng = random.Random(38)
+    spots = [make_spot(f"C{idx}", distance=rng.uniform(0, 15000), bearing=rng.uniform(0, 360)) for idx in range(10_000)]
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("ft_891_hunter.worker.PREFERRED_BANDS", {'20m'})
+        patch.setattr("ft_891_hunter.worker.PREFERRED_MODES", {'SSB'})
+        spot_map.update_spots(spots + [make_spot("CW", distance=100, bearing=0, mode='CW')], [])
+        spot_map.relayout()
+        assert len(spot_map.index) == 10_000
+        assert sum(len(item.data(0)) for item in spot_map.spot_items.values()) == 10_000
+        assert len(spot_map.spot_items) < 2000
+
+        spot_map.scale(50, 50)
+        spot_map.centerOn(*project(10000, 45))
+        spot_map.relayout()
+        assert 0 < sum(len(item.data(0)) for item in spot_map.spot_items.values()) < 200
+
+        spot_map.update_spots([], spots)
+        spot_map.relayout()
+        assert not spot_map.spot_items
+
+
+def test_items_are_reused(spot_map, make_spot):
+    spots = [make_spot(f"C{idx}", distance=1000 + 10 * idx, bearing=45) for idx in range(100)]
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("ft_891_hunter.worker.PREFERRED_BANDS", {'20m'})
+        patch.setattr("ft_891_hunter.worker.PREFERRED_MODES", {'SSB'})
+        spot_map.update_spots(spots, [])
+        spot_map.scale(16, 16)
+        spot_map.centerOn(*project(1500, 45))
+        spot_map.relayout()
+        items = dict(spot_map.spot_items)
+        assert len(items) > 2
+
+        spot_map.relayout()
+        assert spot_map.spot_items == items
+
+        spot_map.update_spots([make_spot("SP9WLG", distance=1000, bearing=45)], spots[:1])
+        spot_map.relayout()
+        changed = {cell for cell, item in spot_map.spot_items.items() if items.get(cell) is not item}
+        assert len(changed) == 1
+        assert {spot.activator for spot in spot_map.spot_items[changed.pop()].data(0)} >= {"SP9WLG"}
+
+        cell = spot_map.clusters(spot_map.level).cell
+        items, shown = dict(spot_map.spot_items), spot_map.shown
+        scroll_bar = spot_map.horizontalScrollBar()
+        scroll_bar.setValue(scroll_bar.value() + int(cell * spot_map.transform().m11()))
+        spot_map.relayout()
+        assert spot_map.shown != shown
+        kept = [cell for cell, item in spot_map.spot_items.items() if items.get(cell) is item]
+        assert kept and len(kept) >= len(spot_map.spot_items) - 2
+
+        spot_map.scale(2, 2)
+        spot_map.relayout()
+        assert not set(spot_map.spot_items.values()) & set(items.values())
+
+
+def test_click_on_spot_tunes(spot_map, make_spot):
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("ft_891_hunter.worker.PREFERRED_BANDS", {'20m'})
+        patch.setattr("ft_891_hunter.worker.PREFERRED_MODES", {'SSB'})
+        spot_map.update_spots([make_spot("SP9WLG", distance=5000, bearing=90, frequency=14285.5)], [])
+    spot_map.relayout()
+    tuned = []
+    spot_map.spot_clicked.connect(tuned.append)
+    pos = spot_map.mapFromScene(QPointF(*project(5000, 90)))
+    event = QMouseEvent(QMouseEvent.Type.MouseButtonPress, QPointF(pos), QPointF(spot_map.mapToGlobal(pos)),
+                        Qt.MouseButton.LeftButton, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier)
+    spot_map.mousePressEvent(event)
+    assert tuned == [14285500]
@@ -0,0 +1,58 @@
+import pytest
+
+from ft_891_hunter.watchlist import AhoCorasick, Watchlist
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    automaton = AhoCorasick(['HE', 'SHE', 'HIS', 'HERS'])
+    assert automaton.search('USHERS') == {'HE', 'SHE', 'HERS'}
+    assert automaton.search('AHISHE') == {'HIS', 'SHE', 'HE'}
+    assert automaton.search('XYZ') == set()
+    assert AhoCorasick([]).search('ANY') == set()
+
+
+def test_aho_corasick_whole_words():
+    automaton = AhoCorasick(['CW', 'SE-0375'])
+    assert automaton.search('CWOPS SE-03751', whole_words=True) == set()
+    assert automaton.search('CW, SE-0375/SE-0376', whole_words=True) == {'CW', 'SE-0375'}
+    assert automaton.search('QRS CW', whole_words=True) == {'CW'}
+
+
+@pytest.fixture
+def watchlist(tmp_path):
+    path = tmp_path / "watchlist.txt"
+    path.write_text(
+        "# chasing\n"
+        "call pa3efr\n"
+        "ref SE-0375\n"
+        "prefix VK9\n"
+        "keyword IOTA  # islands\n"
+        "keyword CW\n"
+        "bogus line\n"
+        "\n",
+        encoding='utf-8'
+    )
+    return Watchlist.load(path)
+
+
+def test_load(watchlist):
+    assert watchlist.calls == {'PA3EFR'}
+    assert watchlist.refs == {'SE-0375'}
+    assert watchlist.keywords == {'IOTA', 'CW'}
+    assert watchlist
+
+
+def test_missing_file_gives_empty_watchlist(tmp_path):
+    assert not Watchlist.load(tmp_path / "missing.txt")
+
+
+def test_match(watchlist, make_spot):
+    assert watchlist.match(make_spot('OE/PA3EFR/P')) == ['OE/PA3EFR/P']
+    assert watchlist.match(make_spot('SM5YRA/P', reference='SE-0375')) == ['SE-0375']
+    assert watchlist.match(make_spot('VK9XY')) == ['VK9']
+    assert watchlist.match(make_spot('VK6GC', comment='iota OC-001')) == ['IOTA']
+    assert watchlist.match(make_spot('SA5ABC', comment='QRV from se-0375')) == ['SE-0375']
+    assert watchlist.match(make_spot('VK6GC', comment='pota')) == []
+    assert watchlist.match(make_spot('VK6GC', comment='CWops member')) == []
+    assert watchlist.match(make_spot('VK6GC', comment='qrs cw')) == ['CW']
+    assert watchlist.match(make_spot('SA5ABC', comment='QRV from SE-03751')) == []